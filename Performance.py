@@ -1,67 +1,109 @@
-import pandas as pd
-import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+import numpy as np
+from dash import dcc, html, callback
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 import re
+from data_loader import load_csv
+from entity_index import build_index, lookup
+from figure_cache import figure_cache
+import data_store
+from search_index import build_search_index, dropdown_option, search_options
+from team_index import team_key
 
 # ملفات البيانات
 csv_file_path = 'C:\\Users\\CONNECT\\OneDrive\\Desktop\\project_dashbord\\Performance Analysts.csv'
 formation_file_path = 'C:\\Users\\CONNECT\\OneDrive\\Desktop\\teams.txt'
 
-# قراءة ملف CSV
-data = pd.read_csv(csv_file_path)
-
 # قراءة التشكيلات من ملف TXT
-with open(formation_file_path, 'r') as file:
-    formations = file.readlines()
-
-# تحويل البيانات
-formations_dict = {}
-for line in formations:
-    match = re.match(r"Team: (.*) - Formation: (.*)", line.strip())
-    if match:
-        team = match.group(1).strip()
-        formation = match.group(2).strip()
-        formations_dict[team] = formation
-
+def load_formations(formation_file_path):
+    with open(formation_file_path, 'r') as file:
+        formations = file.readlines()
+
+    # تحويل البيانات
+    formations_dict = {}
+    for line in formations:
+        match = re.match(r"Team: (.*) - Formation: (.*)", line.strip())
+        if match:
+            team = match.group(1).strip()
+            formation = match.group(2).strip()
+            formations_dict[team] = formation
+    return formations_dict
+
+# قراءة ملف CSV والتشكيلات، ويعاد بناؤها عند تغير أي من الملفين
+def load_analyst_data(csv_file_path, formation_file_path):
+    data = calculate_ratings(load_csv(csv_file_path, categorical=['Team', 'Performance Analyst']))
+    return {
+        'data': data,
+        'index': build_index(data, 'Performance Analyst'),
+        'totals': data.groupby('Performance Analyst', sort=False, observed=True)[TOTAL_COLUMNS].sum(),
+        # التشكيلات حسب مفتاح الفريق لأن ملف التشكيلات يكتب أسماء الفرق بطريقة مختلفة
+        'formations': {team_key(team): formation for team, formation in load_formations(formation_file_path).items()},
+        'search': build_search_index(data['Performance Analyst']),
+    }
+
+data_store.register('analysts', [csv_file_path, formation_file_path], load_analyst_data)
+data_store.on_reload('analysts', lambda analysts: figure_cache.invalidate('analyst'))
+
+# تقييم الهجوم والدفاع، تعمل على عمود كامل (أو قيمة واحدة) دفعة واحدة
 def calculate_attack_performance(goals_scored):
-    if goals_scored >= 1.5:
-        return 6 + (goals_scored - 1.5) * 2
-    else:
-        return 6 - (1.5 - goals_scored) * 2
+    goals_scored = np.asarray(goals_scored, dtype=float)
+    return np.where(goals_scored >= 1.5,
+                    6 + (goals_scored - 1.5) * 2,
+                    6 - (1.5 - goals_scored) * 2)
 
 def calculate_defense_performance(goals_conceded):
-    if goals_conceded <= 1.5:
-        return 5 + (1.5 - goals_conceded) * 2
-    else:
-        return 5 - (goals_conceded - 1.5) * 2
-
-# إعداد تطبيق Dash
-app = dash.Dash(__name__)
-
-# واجهة المستخدم
-app.layout = html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
-    html.H1('Performance Analyst Dashboard', style={'color': '#ffffff', 'textAlign': 'center'}),
-
-    dcc.Dropdown(
-        id='analyst-dropdown',
-        options=[{'label': analyst, 'value': analyst} for analyst in data['Performance Analyst'].unique()],
-        value=data['Performance Analyst'].unique()[0],
-        style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff'}
-    ),
-
-    html.Div(id='analyst-data', style={'color': '#ffffff'}),
-    dcc.Graph(id='goals-chart', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='pass-chart', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='penalty-chart', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='set-piece-chart', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='attack-performance-chart', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='defense-performance-chart', style={'backgroundColor': '#1e1e1e'}),
-    html.Div(id='preferred-formation', style={'color': '#ffffff'}),
-])
-
-@app.callback(
+    goals_conceded = np.asarray(goals_conceded, dtype=float)
+    return np.where(goals_conceded <= 1.5,
+                    5 + (1.5 - goals_conceded) * 2,
+                    5 - (goals_conceded - 1.5) * 2)
+
+# حساب تقييم الهجوم والدفاع لجميع الفرق دفعة واحدة عند التحميل
+def calculate_ratings(data):
+    return data.assign(**{
+        'Attack Rating': calculate_attack_performance(data['Goals Scored']),
+        'Defense Rating': calculate_defense_performance(data['Goals Conceded']),
+    })
+
+# مجاميع كل محلل المستخدمة في الرسوم الدائرية والأفقية
+TOTAL_COLUMNS = ['Goals Scored', 'Passes Attempted', 'Passes Completed', 'Penalty Goals', 'Penalties Awarded', 'Set Piece Goals']
+
+# واجهة المستخدم (تبنى عند كل تحميل للصفحة لتظهر البيانات المحدثة)
+def serve_layout():
+    data = data_store.get('analysts')['data']
+    return html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
+        html.H1('Performance Analyst Dashboard', style={'color': '#ffffff', 'textAlign': 'center'}),
+
+        dcc.Dropdown(
+            id='analyst-dropdown',
+            options=[dropdown_option(data['Performance Analyst'].iloc[0])],
+            value=data['Performance Analyst'].iloc[0],
+            placeholder='Type to search',
+            style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff'}
+        ),
+
+        html.Div(id='analyst-data', style={'color': '#ffffff'}),
+        dcc.Graph(id='goals-chart', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='pass-chart', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='penalty-chart', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='set-piece-chart', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='attack-performance-chart', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='defense-performance-chart', style={'backgroundColor': '#1e1e1e'}),
+        html.Div(id='preferred-formation', style={'color': '#ffffff'}),
+    ])
+
+# البحث في أسماء المحللين على الخادم بدلا من إرسال جميع الأسماء مع الصفحة
+@callback(
+    Output('analyst-dropdown', 'options'),
+    Input('analyst-dropdown', 'search_value'),
+    State('analyst-dropdown', 'value')
+)
+def update_analyst_options(search_value, selected_analyst):
+    if not search_value:
+        raise PreventUpdate
+    return search_options(data_store.get('analysts')['search'], search_value, selected_analyst)
+
+@callback(
     Output('analyst-data', 'children'),
     Output('goals-chart', 'figure'),
     Output('pass-chart', 'figure'),
@@ -73,15 +115,24 @@ app.layout = html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto
     Input('analyst-dropdown', 'value')
 )
 def update_dashboard(selected_analyst):
-    analyst_data = data[data['Performance Analyst'] == selected_analyst]
+    analysts = data_store.get('analysts')
+    return figure_cache.get_or_render(('analyst', selected_analyst, analysts['version']), lambda: render_dashboard(analysts, selected_analyst))
+
+def render_dashboard(analysts, selected_analyst):
+    analyst_data = lookup(analysts['data'], analysts['index'], selected_analyst)
+    formations_dict = analysts['formations']
 
     if analyst_data.empty:
         return [
             html.P("No data available for the selected analyst.")
         ], go.Figure(), go.Figure(), go.Figure(), go.Figure(), go.Figure(), go.Figure(), "No formation available"
 
+    # مرور واحد على فرق المحلل لبناء الإحصائيات والمؤشرات والتشكيلات
     team_stats = []
-    for _, row in analyst_data.iterrows():
+    attack_indicators = []
+    defense_indicators = []
+    team_formation_texts = []
+    for column, row in enumerate(analyst_data.to_dict('records')):
         team_stats.extend([
             html.P(f"Team: {row['Team']}"),
             html.P(f"Goals Scored: {row['Goals Scored']}"),
@@ -95,6 +146,24 @@ def update_dashboard(selected_analyst):
             html.P(f"Penalty Goals: {row['Penalty Goals']}")
         ])
 
+        attack_indicators.append(go.Indicator(
+            mode="number",
+            value=row['Attack Rating'],
+            title=f"Attack Performance for {row['Team']}",
+            domain={'row': 0, 'column': column}
+        ))
+        defense_indicators.append(go.Indicator(
+            mode="number",
+            value=row['Defense Rating'],
+            title=f"Defense Performance for {row['Team']}",
+            domain={'row': 0, 'column': column}
+        ))
+
+        formation_text = f"Preferred Formation for {row['Team']}: {formations_dict.get(team_key(row['Team']), 'No formation available')}"
+        team_formation_texts.append(html.P(formation_text))
+
+    totals = analysts['totals'].loc[selected_analyst]
+
     goals_chart = go.Figure(data=[
         go.Bar(name='Goals Scored', x=analyst_data['Team'], y=analyst_data['Goals Scored']),
         go.Bar(name='Goals Conceded', x=analyst_data['Team'], y=analyst_data['Goals Conceded'])
@@ -103,20 +172,20 @@ def update_dashboard(selected_analyst):
 
     pass_chart = go.Figure(data=[
         go.Pie(labels=['Passes Completed', 'Passes Missed'], 
-               values=[analyst_data['Passes Completed'].sum(), 
-                       analyst_data['Passes Attempted'].sum() - analyst_data['Passes Completed'].sum()])
+               values=[totals['Passes Completed'],
+                       totals['Passes Attempted'] - totals['Passes Completed']])
     ])
     pass_chart.update_layout(title='Pass Completion Rate', template='plotly_dark')
 
     penalty_chart = go.Figure(data=[
         go.Pie(labels=['Penalty Goals', 'Missed Penalties'], 
-               values=[analyst_data['Penalty Goals'].sum(), 
-                       analyst_data['Penalties Awarded'].sum() - analyst_data['Penalty Goals'].sum()])
+               values=[totals['Penalty Goals'],
+                       totals['Penalties Awarded'] - totals['Penalty Goals']])
     ])
     penalty_chart.update_layout(title='Penalty Performance', template='plotly_dark')
 
-    set_piece_goals = analyst_data['Set Piece Goals'].sum()
-    other_goals = analyst_data['Goals Scored'].sum() - set_piece_goals
+    set_piece_goals = totals['Set Piece Goals']
+    other_goals = totals['Goals Scored'] - set_piece_goals
 
     set_piece_chart = go.Figure(data=[
         go.Bar(y=['Set Piece Goals', 'Other Goals'], 
@@ -125,42 +194,16 @@ def update_dashboard(selected_analyst):
     ])
     set_piece_chart.update_layout(title='Set Piece Goals Analysis', template='plotly_dark')
 
-    attack_performance_scores = []
-    attack_performance_chart = go.Figure()
-    for _, row in analyst_data.iterrows():
-        attack_rating = calculate_attack_performance(row['Goals Scored'])
-        attack_performance_scores.append(html.P(f"Attack Performance Rating for {row['Team']}: {attack_rating:.2f} / 10"))
-
-        attack_performance_chart.add_trace(go.Indicator(
-            mode="number",
-            value=attack_rating,
-            title=f"Attack Performance for {row['Team']}",
-            domain={'row': 0, 'column': 0}
-        ))
+    attack_performance_chart = go.Figure(data=attack_indicators)
     attack_performance_chart.update_layout(template='plotly_dark', grid={'rows': 1, 'columns': len(analyst_data)})
 
-    defense_performance_scores = []
-    defense_performance_chart = go.Figure()
-    for _, row in analyst_data.iterrows():
-        defense_rating = calculate_defense_performance(row['Goals Conceded'])
-        defense_performance_scores.append(html.P(f"Defense Performance Rating for {row['Team']}: {defense_rating:.2f} / 10"))
-
-        defense_performance_chart.add_trace(go.Indicator(
-            mode="number",
-            value=defense_rating,
-            title=f"Defense Performance for {row['Team']}",
-            domain={'row': 0, 'column': 0}
-        ))
+    defense_performance_chart = go.Figure(data=defense_indicators)
     defense_performance_chart.update_layout(template='plotly_dark', grid={'rows': 1, 'columns': len(analyst_data)})
 
-    team_formation_texts = []
-    for team in analyst_data['Team']:
-        formation_text = f"Preferred Formation for {team}: {formations_dict.get(team, 'No formation available')}"
-        team_formation_texts.append(html.P(formation_text))
-    
     return team_stats, goals_chart, pass_chart, penalty_chart, set_piece_chart, attack_performance_chart, defense_performance_chart, html.Div(team_formation_texts)
 
-# Run the server using waitress
-if __name__ == '__main__':
-    from waitress import serve
-    serve(app.server, host='0.0.0.0', port=8000)
+# رسم جميع المحللين مسبقا قبل تشغيل الخادم (FIGURE_CACHE_WARMUP=1)
+def warm_up_cache():
+    analysts = data_store.get('analysts')
+    figure_cache.warm_up('analyst', analysts['data']['Performance Analyst'].unique(), analysts['version'],
+                         lambda name: render_dashboard(analysts, name))
@@ -0,0 +1,105 @@
+import logging
+import os
+
+import dash
+from dash import dcc, html
+from dash.dependencies import Input, Output
+from flask import jsonify
+from waitress import serve
+
+import data_store
+from figure_cache import WARM_UP
+import metrics
+import compression
+import dashbord1
+import manger
+import Performance
+import leaderboard
+import teams
+import seasons
+
+# One Dash server for the player, coach and analyst views.
+# Each view registers its callbacks on import. main() starts serving right away
+# and loads every dataset in the background; a request that needs data still
+# being loaded waits for it. /ready reports when everything is loaded.
+external_stylesheets = [
+    {
+        'href': 'https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css',
+        'rel': 'stylesheet',
+        'integrity': 'sha384-B4gt1jrGC7Jh4AgTPSdUtOBvfO8sh+wyZ3B/cEYLxtY0QoZsibTNF5IT8+9ePLZB',
+        'crossorigin': 'anonymous'
+    },
+    {
+        'href': 'https://fonts.googleapis.com/css2?family=Roboto&display=swap',
+        'rel': 'stylesheet'
+    }
+]
+
+PAGES = {
+    '/players': ('Players', dashbord1),
+    '/coaches': ('Coaches', manger),
+    '/analysts': ('Performance Analysts', Performance),
+    '/leaderboard': ('Leaderboard', leaderboard),
+    '/teams': ('Teams', teams),
+}
+DEFAULT_PAGE = '/players'
+
+app = dash.Dash(__name__, external_stylesheets=external_stylesheets, suppress_callback_exceptions=True)
+server = app.server
+
+link_style = {'color': '#05ab92', 'marginRight': '20px'}
+
+app.layout = html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto', 'minHeight': '100vh'}, children=[
+    dcc.Location(id='url'),
+    html.Div(style={'padding': '10px'}, children=[
+        dcc.Link(title, href=path, style=link_style) for path, (title, _) in PAGES.items()
+    ]),
+    html.Div(id='page-content'),
+])
+
+
+@app.callback(Output('page-content', 'children'), Input('url', 'pathname'))
+def display_page(pathname):
+    _, module = PAGES.get(pathname, PAGES[DEFAULT_PAGE])
+    return module.serve_layout()
+
+
+metrics.init_app(app)
+leaderboard.init_app(app)
+manger.init_app(app)
+seasons.init_app(app)
+# Registered last so it runs first among the after_request hooks: /metrics records the compressed size
+compression.init_app(app)
+
+
+# Liveness: the process is up. Readiness: every dataset is loaded (and the figure cache warmed)
+@server.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+
+@server.route('/ready')
+def ready():
+    status = data_store.readiness()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
+def warm_up():
+    for _, module in PAGES.values():
+        if hasattr(module, 'warm_up_cache'):
+            module.warm_up_cache()
+
+
+def start_background_tasks():
+    data_store.start_preload(on_ready=[warm_up] if WARM_UP else [])
+    data_store.start_watcher()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    start_background_tasks()
+    serve(server, host='0.0.0.0', port=int(os.environ.get('PORT', '8000')))
+
+
+if __name__ == '__main__':
+    main()
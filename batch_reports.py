@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+import data_store
+import dashbord1
+import manger
+import Performance
+
+# Nightly static reports for every player, coach and analyst.
+# Reuses the figure building of the dashboard views and spreads the entities
+# over a process pool; every worker loads the data once through data_store.
+
+# The plotly.js release bundled with the installed plotly, so the page matches the figure JSON
+# (plotly-latest.min.js on the CDN is frozen at 1.58.5)
+PLOTLYJS_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+VIEWS = {
+    'players': ('players', 'player name'),
+    'coaches': ('coaches', 'Manager'),
+    'analysts': ('analysts', 'Performance Analyst'),
+}
+
+
+def render_outputs(view, name):
+    if view == 'players':
+        players = data_store.get('players')
+        return list(dashbord1.render_dashboard(players, name)) + [dashbord1.render_pass_map(players, name)]
+    if view == 'coaches':
+        coaches = data_store.get('coaches')
+        return list(manger.render_dashboard(coaches, name)) + [manger.render_highlighted_ranking(coaches, name)]
+    return list(Performance.render_dashboard(data_store.get('analysts'), name))
+
+
+# Plain text of the html.P / html.Div stats blocks
+def component_text(component):
+    if component is None:
+        return []
+    if isinstance(component, str):
+        return [component]
+    if isinstance(component, (list, tuple)):
+        return [text for child in component for text in component_text(child)]
+    children = getattr(component, 'children', None)
+    if isinstance(children, str):
+        return [children]
+    return component_text(children)
+
+
+def safe_file_name(name):
+    return re.sub(r'[^\w.-]+', '_', str(name), flags=re.UNICODE).strip('_') or 'unnamed'
+
+
+def write_report(view, name, outputs, output_dir, output_format):
+    figures = [output for output in outputs if isinstance(output, go.Figure)]
+    path = os.path.join(output_dir, view, f"{safe_file_name(name)}.{output_format}")
+
+    if output_format == 'json':
+        report = {
+            'name': name,
+            'text': [text for output in outputs if not isinstance(output, go.Figure) for text in component_text(output)],
+            'figures': [json.loads(pio.to_json(figure)) for figure in figures],
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file)
+        return path
+
+    parts = [f"<h1>{escape(str(name))}</h1>"]
+    for output in outputs:
+        if isinstance(output, go.Figure):
+            parts.append(pio.to_html(output, full_html=False, include_plotlyjs=False))
+        else:
+            parts.extend(f"<p>{escape(str(text))}</p>" for text in component_text(output))
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('<html><head><meta charset="utf-8">'
+                   f'<script src="{PLOTLYJS_URL}"></script></head>'
+                   f"<body style=\"background-color:#0a0606;color:#ffffff\">{''.join(parts)}</body></html>")
+    return path
+
+
+def render_report(task):
+    view, name, output_dir, output_format = task
+    started = time.perf_counter()
+    path = write_report(view, name, render_outputs(view, name), output_dir, output_format)
+    return view, name, path, time.perf_counter() - started
+
+
+def entity_names(view):
+    dataset, column = VIEWS[view]
+    return list(data_store.get(dataset)['data'][column].dropna().unique())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render static reports for every player, coach and analyst.')
+    parser.add_argument('--views', nargs='+', choices=list(VIEWS), default=list(VIEWS))
+    parser.add_argument('--output-dir', default='reports')
+    parser.add_argument('--format', choices=['html', 'json'], default='html')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    tasks = []
+    for view in args.views:
+        os.makedirs(os.path.join(args.output_dir, view), exist_ok=True)
+        tasks.extend((view, name, args.output_dir, args.format) for name in entity_names(view))
+
+    started = time.perf_counter()
+    timings = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        chunksize = max(1, len(tasks) // (args.workers * 4))
+        for view, name, path, seconds in executor.map(render_report, tasks, chunksize=chunksize):
+            timings.append({'view': view, 'name': name, 'path': path, 'seconds': round(seconds, 4)})
+            print(f"{view:9} {seconds * 1000:8.1f} ms  {name}")
+    elapsed = time.perf_counter() - started
+
+    with open(os.path.join(args.output_dir, 'timings.json'), 'w', encoding='utf-8') as file:
+        json.dump({'total_seconds': round(elapsed, 3), 'workers': args.workers, 'reports': timings}, file, indent=2)
+    print(f"{len(timings)} reports in {elapsed:.1f} s with {args.workers} workers")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import data_store
+from figure_cache import figure_cache
+import dashbord1
+import manger
+import Performance
+
+# Scaling benchmarks for the dashboards.
+# Generates synthetic tables with the schemas of players_statistics.csv,
+# la_liga_managers_2024.csv and "Performance Analysts.csv", then times loading,
+# calculate_ranking and every update_dashboard callback end to end (cache misses).
+# Results are written as JSON; pass --compare with an earlier file to see the change.
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+TEAMS_PER_ROW = 1 / 25
+
+
+def _names(prefix, count):
+    return (prefix + ' ' + pd.Series(np.arange(count)).astype(str)).to_numpy()
+
+
+def _positions(rng, count, low, high):
+    points = np.round(rng.uniform(low, high, size=(count, 2)), 1)
+    return [f"({x}, {y})" for x, y in points]
+
+
+def synthetic_players(rows, rng):
+    teams = _names('Team', max(1, int(rows * TEAMS_PER_ROW)))
+    matches = rng.integers(1, 39, rows)
+    total_passes = rng.integers(100, 2500, rows)
+    return pd.DataFrame({
+        'player name': _names('Player', rows),
+        'player team': rng.choice(teams, rows),
+        'Matches': matches,
+        'goals': rng.integers(0, 30, rows),
+        'Minutes Played': matches * rng.integers(10, 91, rows),
+        'Total Passes': total_passes,
+        'Successful Passes': (total_passes * rng.uniform(0.5, 0.95, rows)).astype(int),
+        'Pass Start Position': _positions(rng, rows, 0, 60),
+        'Pass End Position': _positions(rng, rows, 0, 68),
+    })
+
+
+def synthetic_managers(rows, rng):
+    wins = rng.integers(0, 30, rows)
+    draws = rng.integers(0, 9, rows)
+    return pd.DataFrame({
+        'Manager': _names('Manager', rows),
+        'Team': _names('Team', rows),
+        'Matches': 38,
+        'Wins': wins,
+        'Draws': draws,
+        'Losses': np.maximum(38 - wins - draws, 0),
+        'Goals Scored': rng.integers(20, 100, rows),
+        'Goals Conceded': rng.integers(15, 80, rows),
+        'Trophies': rng.integers(0, 3, rows),
+        'Goalkeeper': _names('Keeper', rows),
+        'Defenders': 'Defender A, Defender B, Defender C, Defender D',
+        'Midfielders': 'Midfielder A, Midfielder B, Midfielder C',
+        'Forwards': 'Forward A, Forward B, Forward C',
+    })
+
+
+def synthetic_analysts(rows, rng):
+    attempted = rng.integers(10_000, 20_000, rows)
+    awarded = rng.integers(0, 12, rows)
+    return pd.DataFrame({
+        'Team': _names('Team', rows),
+        # Every analyst covers two teams
+        'Performance Analyst': _names('Analyst', rows // 2 + 1)[np.arange(rows) // 2],
+        'Goals Scored': rng.integers(20, 100, rows),
+        'Goals Conceded': rng.integers(15, 80, rows),
+        'Top Scorer (Goals)': 'Striker (12)',
+        'Top Clean Sheet Keeper (Clean Sheets)': 'Keeper (10)',
+        'Passes Attempted': attempted,
+        'Passes Completed': (attempted * rng.uniform(0.7, 0.9, rows)).astype(int),
+        'Set Piece Goals': rng.integers(0, 15, rows),
+        'Penalty Goals': np.minimum(rng.integers(0, 10, rows), awarded),
+        'Penalties Awarded': awarded,
+        'Matches': 38,
+    })
+
+
+def write_dataset(directory, rows, seed):
+    rng = np.random.default_rng(seed)
+    paths = {
+        'players': os.path.join(directory, 'players_statistics.csv'),
+        'coaches': os.path.join(directory, 'la_liga_managers_2024.csv'),
+        'analysts': os.path.join(directory, 'Performance Analysts.csv'),
+        'formations': os.path.join(directory, 'teams.txt'),
+    }
+    synthetic_players(rows, rng).to_csv(paths['players'], index=False)
+    synthetic_managers(rows, rng).to_csv(paths['coaches'], index=False)
+    analysts = synthetic_analysts(rows, rng)
+    analysts.to_csv(paths['analysts'], index=False)
+    with open(paths['formations'], 'w') as file:
+        file.writelines(f"Team: {team} - Formation: 4-3-3\n" for team in analysts['Team'])
+    return paths
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        'median_ms': round(statistics.median(samples) * 1000, 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+        'max_ms': round(samples[-1] * 1000, 3),
+        'samples': len(samples),
+    }
+
+
+def _time_callback(callback, dashboards, names, *extra):
+    samples = []
+    for name in names:
+        for dashboard in dashboards:
+            figure_cache.invalidate(dashboard)
+        samples.append(_timed(callback, name, *extra)[1])
+    return _summary(samples)
+
+
+def run_size(rows, samples, seed):
+    results = {'rows': rows}
+    with tempfile.TemporaryDirectory() as directory:
+        # The synthetic files share the real files' names: keep their snapshots in the
+        # temporary directory so they neither hit nor replace the production ones
+        snapshot_dir = data_loader.SNAPSHOT_DIR
+        data_loader.SNAPSHOT_DIR = os.path.join(directory, '.snapshots')
+        try:
+            return _run_size(results, directory, rows, samples, seed)
+        finally:
+            data_loader.SNAPSHOT_DIR = snapshot_dir
+
+
+def _run_size(results, directory, rows, samples, seed):
+    paths, generate_seconds = _timed(write_dataset, directory, rows, seed)
+    results['generate_s'] = round(generate_seconds, 4)
+    datasets = {
+        'players': ([paths['players']], dashbord1.load_player_data),
+        'coaches': ([paths['coaches']], manger.load_coach_data),
+        'analysts': ([paths['analysts'], paths['formations']], Performance.load_analyst_data),
+    }
+
+    # First load parses the CSV and writes a snapshot, the second reads the snapshot
+    for dataset, (dataset_paths, build) in datasets.items():
+        # Not resolved against DASHBOARD_DATA_DIR, which would swap in the real files
+        data_store.register(dataset, dataset_paths, build, resolve=False)
+        results[f"load_{dataset}_csv_s"] = round(_timed(data_store.get, dataset)[1], 4)
+        results[f"load_{dataset}_snapshot_s"] = round(_timed(build, *dataset_paths)[1], 4)
+
+    rng = np.random.default_rng(seed)
+    players = data_store.get('players')['data']['player name'].unique()
+    coaches = data_store.get('coaches')['data']
+    analysts = data_store.get('analysts')['data']['Performance Analyst'].unique()
+    player_sample = rng.choice(players, min(samples, len(players)), replace=False)
+    coach_sample = rng.choice(coaches['Manager'].unique(), min(samples, len(coaches)), replace=False)
+    analyst_sample = rng.choice(analysts, min(samples, len(analysts)), replace=False)
+
+    # Building the ranking table once, then the per-selection lookup
+    results['ranking_build_s'] = round(_timed(manger.get_ranking, coaches)[1], 4)
+    results['calculate_ranking'] = _summary([_timed(manger.calculate_ranking, coaches, name)[1] for name in coach_sample])
+
+    results['player_update_dashboard'] = _time_callback(dashbord1.update_dashboard, ['player'], player_sample)
+    results['player_update_pass_map'] = _time_callback(dashbord1.update_pass_map, ['player-passes'], player_sample,
+                                                       dashbord1.DEFAULT_PASS_MAP_MODE)
+    results['coach_update_dashboard'] = _time_callback(manger.update_dashboard, ['coach'], coach_sample)
+    results['analyst_update_dashboard'] = _time_callback(Performance.update_dashboard, ['analyst'], analyst_sample)
+    return results
+
+
+def compare(results, previous):
+    previous_by_rows = {entry['rows']: entry for entry in previous['results']}
+    for entry in results['results']:
+        before = previous_by_rows.get(entry['rows'])
+        if before is None:
+            continue
+        print(f"rows={entry['rows']}")
+        for key, value in entry.items():
+            old = before.get(key)
+            if isinstance(value, dict) and isinstance(old, dict):
+                value, old = value['median_ms'], old['median_ms']
+            if key == 'rows' or not isinstance(value, (int, float)) or not old:
+                continue
+            print(f"  {key:32} {old:12.4f} -> {value:12.4f}  ({(value - old) / old * 100:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time loading and callbacks on synthetic data of growing size.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='rows per table, e.g. 1000 1000000')
+    parser.add_argument('--samples', type=int, default=20, help='selections timed per callback')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    results = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': [],
+    }
+    for rows in args.sizes:
+        entry = run_size(rows, args.samples, args.seed)
+        results['results'].append(entry)
+        print(json.dumps(entry))
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            compare(results, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import numpy as np
+
+# Headless coach metrics shared by the coaches dashboard, batch reports, the
+# season aggregates and /api/coaches.
+# Every function works on whole columns (NumPy arrays or pandas Series) so any
+# number of managers is scored in one pass; a single manager is just a
+# one-element column. Nothing here imports Dash or Plotly.
+
+
+def _per_match(values, matches):
+    values = np.asarray(values, dtype=float)
+    matches = np.asarray(matches, dtype=float)
+    played = matches > 0
+    return np.where(played, values / np.where(played, matches, 1), 0)
+
+
+def win_rate(wins, matches):
+    return _per_match(wins, matches) * 100
+
+
+def goals_per_match(goals, matches):
+    return _per_match(goals, matches)
+
+
+def offensive_score(scored_per_match):
+    scored_per_match = np.asarray(scored_per_match, dtype=float)
+    score = np.where(scored_per_match > 1.5,
+                     6 + (scored_per_match - 1.5) * 2.67,
+                     6 * (scored_per_match / 1.5))
+    return np.minimum(score, 10)
+
+
+def defensive_score(conceded_per_match):
+    conceded_per_match = np.asarray(conceded_per_match, dtype=float)
+    score = np.where(conceded_per_match < 1.5,
+                     5 + (1.5 - conceded_per_match) * 3.33,
+                     5 - (conceded_per_match - 1.5) * 3.33)
+    return np.maximum(score, 0)
+
+
+def overall_score(win_rates, offensive_scores, defensive_scores):
+    return (np.asarray(win_rates) * 0.4 + np.asarray(offensive_scores) * 0.3 + np.asarray(defensive_scores) * 0.3) / 10
+
+
+def calculate_scores(coach_data):
+    matches = coach_data['Matches']
+    rates = win_rate(coach_data['Wins'], matches)
+    scored = goals_per_match(coach_data['Goals Scored'], matches)
+    conceded = goals_per_match(coach_data['Goals Conceded'], matches)
+    offensive = offensive_score(scored)
+    defensive = defensive_score(conceded)
+    return coach_data.assign(**{
+        'Win Rate': rates,
+        'Goals per Match': scored,
+        'Conceded per Match': conceded,
+        'Offensive Score': offensive,
+        'Defensive Score': defensive,
+        'Overall Score': overall_score(rates, offensive, defensive),
+    })
+
+
+def build_ranking(coach_data):
+    scores = calculate_scores(coach_data)
+    sorted_scores = np.sort(scores['Overall Score'].to_numpy())
+    # Managers with a score at or above each one's, the rank shown on the dashboard
+    scores['Rank'] = len(sorted_scores) - np.searchsorted(sorted_scores, scores['Overall Score'].to_numpy(), side='left')
+    ranking = {
+        'source': coach_data,
+        'scores': scores,
+        'sorted': scores.sort_values(by='Overall Score', ascending=False, kind='mergesort'),
+        'sorted_scores': sorted_scores,
+        'score_by_manager': scores.drop_duplicates('Manager').set_index('Manager')['Overall Score'].to_dict(),
+    }
+    # Bar position of each manager in the ranking chart (first occurrence of the name)
+    managers = ranking['sorted']['Manager'].tolist()
+    ranking['position_by_manager'] = {manager: position for position, manager in reversed(list(enumerate(managers)))}
+    return ranking
+
+
+def rank_coach(ranking_table, selected_coach):
+    sorted_scores = ranking_table['sorted_scores']
+    selected_coach_score = ranking_table['score_by_manager'][selected_coach]
+    # Binary search for the number of managers scoring at least as much
+    ranking = len(sorted_scores) - int(np.searchsorted(sorted_scores, selected_coach_score, side='left'))
+
+    return ranking, ranking_table['sorted']
+
+
+# Scored rows of the given managers (all when names is None) as plain dicts,
+# one per manager in the order asked for; unknown names are skipped
+def coach_records(ranking_table, index, names=None):
+    scores = ranking_table['scores']
+    if names is None:
+        return scores.drop_duplicates('Manager').to_dict('records')
+    positions = [index[name][0] for name in names if name in index]
+    return scores.iloc[positions].to_dict('records')
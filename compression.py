@@ -0,0 +1,37 @@
+import gzip
+import os
+
+from flask import request
+
+# gzip compression of the Dash server's dynamic responses.
+# Callback and layout responses are mostly figure JSON with long runs of repeated
+# keys and numbers, so they shrink several times over. Static files (the Dash JS
+# bundles run to megabytes) are left alone: compressing them on every uncached
+# page load costs more CPU than it saves, and browsers cache them anyway. Tiny
+# responses and clients that did not ask for gzip get the body as it is.
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '500'))
+COMPRESSIBLE_TYPES = {'application/json', 'text/html'}
+STATIC_PREFIXES = ('/_dash-component-suites/', '/assets/', '/static/')
+
+
+def _accepts_gzip():
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+
+def init_app(app, level=COMPRESS_LEVEL, min_size=COMPRESS_MIN_SIZE):
+    @app.server.after_request
+    def compress_response(response):
+        if (response.status_code < 200 or response.status_code >= 300 or response.direct_passthrough
+                or response.mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers
+                or request.path.startswith(STATIC_PREFIXES)):
+            return response
+        response.vary.add('Accept-Encoding')
+        if not _accepts_gzip():
+            return response
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(gzip.compress(body, compresslevel=level))
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
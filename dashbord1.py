@@ -1,76 +1,114 @@
-import pandas as pd
-import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash import dcc, html, callback
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import plotly.graph_objects as go
+from data_loader import load_csv
+from entity_index import build_index, lookup
+from passes import parse_positions, build_pass_density, density_grid, cell_centres
+from figure_cache import figure_cache
+import data_store
+from search_index import build_search_index, dropdown_option, search_options
+from leaderboard import build_leaderboard
 file_path = 'C:\\Users\\CONNECT\\OneDrive\\Desktop\\project_dashbord\\players_statistics.csv'
-# Load the data with the updated path
-try:
-    data = pd.read_csv(file_path, encoding='utf-8')
-except UnicodeDecodeError:
-    # If utf-8 fails, try ISO-8859-1 encoding
-    try:
-        data = pd.read_csv(file_path, encoding='ISO-8859-1')
-    except UnicodeDecodeError:
-        # If ISO-8859-1 fails, try latin1 encoding
-        try:
-            data = pd.read_csv(file_path, encoding='latin1')
-        except UnicodeDecodeError:
-            # Use chardet to detect the file encoding
-            with open(file_path, 'rb') as file:
-                result = chardet.detect(file.read())
-                encoding = result['encoding']
-                # Read the file using the detected encoding
-                data = pd.read_csv(file_path, encoding=encoding)# Create a Dash application
-app = dash.Dash(__name__)
-
-# Define custom CSS styles
-external_stylesheets = [
-    {
-        'href': 'https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css',
-        'rel': 'stylesheet',
-        'integrity': 'sha384-B4gt1jrGC7Jh4AgTPSdUtOBvfO8sh+wyZ3B/cEYLxtY0QoZsibTNF5IT8+9ePLZB',
-        'crossorigin': 'anonymous'
-    },
-    {
-        'href': 'https://fonts.googleapis.com/css2?family=Roboto&display=swap',
-        'rel': 'stylesheet'
+
+
+# Load the data and everything derived from it; rebuilt whenever the file changes
+def load_player_data(file_path):
+    data = load_csv(file_path, categorical=['player name', 'player team'])
+    pass_start = parse_positions(data['Pass Start Position'])
+    pass_end = parse_positions(data['Pass End Position'])
+    # The coordinate strings are replaced by the float32 arrays above
+    data = data.drop(columns=['Pass Start Position', 'Pass End Position'])
+    return {
+        'data': data,
+        'index': build_index(data, 'player name'),
+        'pass_start': pass_start,
+        'pass_end': pass_end,
+        'pass_density': build_pass_density(data['player name'], pass_start, pass_end),
+        'leaderboard': build_leaderboard(data),
+        'search': build_search_index(data['player name']),
     }
-]
 
-# Apply external stylesheets to the app
-app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
 
-# Layout of the dashboard with custom styles
-app.layout = html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
-    html.H1('laliga Player Statistics ', style={'color': '#ffffff', 'textAlign': 'center'}),
+data_store.register('players', [file_path], load_player_data)
+
 
-    dcc.Dropdown(
-        id='player-dropdown',
-        options=[{'label': player, 'value': player} for player in data['player name'].unique()],
-        value=data['player name'].unique()[0],
-        style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff'}
-    ),
+def clear_player_figures(players):
+    figure_cache.invalidate('player')
+    figure_cache.invalidate('player-passes')
 
-    html.Div(id='player-data', style={'color': '#ffffff'}),
 
-    dcc.Graph(id='goals-per-match-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='pass-success-rate-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='player-performance-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='pass-heatmap-graph', style={'backgroundColor': '#1e1e1e'})  # Add graph for heatmap
-])
+data_store.on_reload('players', clear_player_figures)
+
+# Modes of the pass map: binned densities keep the payload constant however many passes a player has
+PASS_MAP_MODES = [
+    {'label': 'Pass density', 'value': 'both'},
+    {'label': 'Pass start density', 'value': 'start'},
+    {'label': 'Pass end density', 'value': 'end'},
+    {'label': 'Individual passes', 'value': 'points'},
+]
+DEFAULT_PASS_MAP_MODE = 'both'
+
+# Layout of the dashboard with custom styles
+# Built per page load so the dropdown picks up reloaded data
+def serve_layout():
+    data = data_store.get('players')['data']
+    return html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
+        html.H1('laliga Player Statistics ', style={'color': '#ffffff', 'textAlign': 'center'}),
+
+        dcc.Dropdown(
+            id='player-dropdown',
+            options=[dropdown_option(data['player name'].iloc[0])],
+            value=data['player name'].iloc[0],
+            placeholder='Type to search',
+            style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff'}
+        ),
+
+        html.Div(id='player-data', style={'color': '#ffffff'}),
+
+        dcc.Graph(id='goals-per-match-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='pass-success-rate-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='player-performance-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.RadioItems(
+            id='pass-map-mode',
+            options=PASS_MAP_MODES,
+            value=DEFAULT_PASS_MAP_MODE,
+            inline=True,
+            style={'color': '#ffffff'}
+        ),
+        dcc.Graph(id='pass-heatmap-graph', style={'backgroundColor': '#1e1e1e'})  # Add graph for heatmap
+    ])
+
+
+# Dropdown options are searched on the server instead of shipping every name in the layout
+@callback(
+    Output('player-dropdown', 'options'),
+    Input('player-dropdown', 'search_value'),
+    State('player-dropdown', 'value')
+)
+def update_player_options(search_value, selected_player):
+    if not search_value:
+        raise PreventUpdate
+    return search_options(data_store.get('players')['search'], search_value, selected_player)
+
 
-@app.callback(
+@callback(
     Output('player-data', 'children'),
     Output('goals-per-match-graph', 'figure'),
     Output('pass-success-rate-graph', 'figure'),
     Output('player-performance-graph', 'figure'),
-    Output('pass-heatmap-graph', 'figure'),  # Output for heatmap
     Input('player-dropdown', 'value')
 )
 def update_dashboard(selected_player):
-    player_data = data[data['player name'] == selected_player].iloc[0]
+    players = data_store.get('players')
+    return figure_cache.get_or_render(('player', selected_player, players['version']), lambda: render_dashboard(players, selected_player))
+
+
+def render_dashboard(players, selected_player):
+    player_data = lookup(players['data'], players['index'], selected_player).iloc[0]
+    # Metrics of the same row in the leaderboard table, so both views show the same values
+    metrics = lookup(players['leaderboard']['table'], players['index'], selected_player).iloc[0]
 
     player_stats = [
         html.P(f"Player: {player_data['player name']}"),
@@ -82,9 +120,8 @@ def update_dashboard(selected_player):
         html.P(f"Successful Passes: {player_data['Successful Passes']}")
     ]
 
-    goals_per_match = player_data['goals'] / player_data['Matches']
-    pass_success_rate = (player_data['Successful Passes'] / player_data['Total Passes']) * 100
-    performance_score = (player_data['goals'] * 2 + pass_success_rate * 0.5 + player_data['Minutes Played'] / 500) / 10
+    goals_per_match = metrics['goals_per_match']
+    performance_score = metrics['performance_score']
 
     goals_per_match_fig = px.bar(
         x=['Goals per Match'], 
@@ -111,30 +148,58 @@ def update_dashboard(selected_player):
         template='plotly_dark'
     )
 
-    # Creating heatmap data
-    passes_data = data[data['player name'] == selected_player]
-    start_positions = passes_data['Pass Start Position'].str.strip('()').str.split(',', expand=True).astype(float)
-    end_positions = passes_data['Pass End Position'].str.strip('()').str.split(',', expand=True).astype(float)
+    return player_stats, goals_per_match_fig, pass_success_rate_fig, performance_fig
+
 
+@callback(
+    Output('pass-heatmap-graph', 'figure'),  # Output for heatmap
+    Input('player-dropdown', 'value'),
+    Input('pass-map-mode', 'value')
+)
+def update_pass_map(selected_player, mode):
+    players = data_store.get('players')
+    return figure_cache.get_or_render(('player-passes', (selected_player, mode), players['version']),
+                                      lambda: render_pass_map(players, selected_player, mode))
+
+
+def render_pass_map(players, selected_player, mode=DEFAULT_PASS_MAP_MODE):
     heatmap_fig = go.Figure()
 
-    # Adding pass start positions
-    heatmap_fig.add_trace(go.Scatter(
-        x=start_positions[0],
-        y=start_positions[1],
-        mode='markers',
-        marker=dict(size=5, color='blue', opacity=0.5),
-        name='Pass Start'
-    ))
-
-    # Adding pass end positions
-    heatmap_fig.add_trace(go.Scatter(
-        x=end_positions[0],
-        y=end_positions[1],
-        mode='markers',
-        marker=dict(size=5, color='red', opacity=0.5),
-        name='Pass End'
-    ))
+    if mode == 'points':
+        # Creating heatmap data
+        player_rows = players['index'].get(selected_player, [])
+        start_positions = players['pass_start'][player_rows]
+        end_positions = players['pass_end'][player_rows]
+
+        # Adding pass start positions
+        heatmap_fig.add_trace(go.Scatter(
+            x=start_positions[:, 0],
+            y=start_positions[:, 1],
+            mode='markers',
+            marker=dict(size=5, color='blue', opacity=0.5),
+            name='Pass Start'
+        ))
+
+        # Adding pass end positions
+        heatmap_fig.add_trace(go.Scatter(
+            x=end_positions[:, 0],
+            y=end_positions[:, 1],
+            mode='markers',
+            marker=dict(size=5, color='red', opacity=0.5),
+            name='Pass End'
+        ))
+    else:
+        density = players['pass_density']
+        x_centres, y_centres = cell_centres(density)
+        heatmap_fig.add_trace(go.Heatmap(
+            x=x_centres,
+            y=y_centres,
+            z=density_grid(density, selected_player, mode),
+            zmin=0,
+            colorscale='Viridis',
+            colorbar=dict(title='Passes'),
+            name='Passes'
+        ))
 
     heatmap_fig.update_layout(
         title='Heatmap of Player Passes',
@@ -146,10 +211,13 @@ def update_dashboard(selected_player):
         template='plotly_dark'
     )
 
-    return player_stats, goals_per_match_fig, pass_success_rate_fig, performance_fig, heatmap_fig
-
+    return heatmap_fig
 
-if __name__ == '__main__':
-    from waitress import serve
-    serve(app.server, host='0.0.0.0', port=8000)
 
+# Pre-render every player before serving (FIGURE_CACHE_WARMUP=1)
+def warm_up_cache():
+    players = data_store.get('players')
+    names = players['data']['player name'].unique()
+    figure_cache.warm_up('player', names, players['version'], lambda name: render_dashboard(players, name))
+    figure_cache.warm_up('player-passes', [(name, DEFAULT_PASS_MAP_MODE) for name in names], players['version'],
+                         lambda key: render_pass_map(players, *key))
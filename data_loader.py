@@ -0,0 +1,177 @@
+import codecs
+import hashlib
+import io
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Shared CSV loading for the dashboards.
+# The source file is read from disk once: the raw bytes are hashed, decoded with
+# the detected encoding and parsed from memory. The parsed frame is written to a
+# Feather snapshot keyed by that hash so later startups skip CSV parsing.
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get('DATA_SNAPSHOT_DIR')
+# Map snapshots into memory instead of reading them, so processes serving the same
+# files share one copy of the numeric columns through the page cache
+MEMORY_MAP = os.environ.get('DATA_MEMORY_MAP', '0') == '1'
+
+# UTF-8 text that was decoded as latin-1 and saved again ("HernÃ¡ndez")
+MOJIBAKE_PATTERN = re.compile('(?:[Â-ß][\u0080-¿]|[à-ï][\u0080-¿]{2})+')
+
+
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def detect_encoding(raw):
+    for bom, encoding in BOM_ENCODINGS:
+        if raw.startswith(bom):
+            return encoding
+    return 'utf-8'
+
+
+# Our exports are UTF-8 with the odd cp1252/latin-1 byte pasted in ("Jos\xe9").
+# Decoding as UTF-8 and mapping only the invalid bytes keeps both kinds of text
+# intact in a single pass, where a whole-file latin-1 decode would garble the UTF-8.
+def _legacy_byte_fallback(error):
+    invalid = error.object[error.start:error.end]
+    return ''.join(bytes([byte]).decode('cp1252', errors='ignore') or chr(byte) for byte in invalid), error.end
+
+
+codecs.register_error('legacy-byte-fallback', _legacy_byte_fallback)
+
+
+def decode(raw):
+    return raw.decode(detect_encoding(raw), errors='legacy-byte-fallback')
+
+
+def _repair(match):
+    text = match.group(0)
+    try:
+        return text.encode('latin1').decode('utf-8')
+    except UnicodeDecodeError:
+        return text
+
+
+def repair_mojibake(text):
+    return MOJIBAKE_PATTERN.sub(_repair, text)
+
+
+def drop_empty_columns(frame):
+    empty = [
+        column for column in frame.columns
+        if str(column).startswith('Unnamed:') and frame[column].isna().all()
+    ]
+    return frame.drop(columns=empty)
+
+
+def memory_usage(frame):
+    return int(frame.memory_usage(deep=True).sum())
+
+
+# Categorical dtypes for the given (repeated) text columns and int32 for counts.
+# Counts stay at int32 rather than the narrowest type: per-row arithmetic such as
+# goals * 2 and groupby sums keep the column dtype and would overflow int8/int16.
+def compact(frame, categorical=()):
+    columns = {}
+    int32 = np.iinfo(np.int32)
+    for column in frame.columns:
+        series = frame[column]
+        if column in categorical:
+            columns[column] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series) and series.dtype.itemsize > 4:
+            if series.empty or (series.min() >= int32.min and series.max() <= int32.max):
+                columns[column] = series.astype(np.int32)
+    return frame.assign(**columns)
+
+
+def snapshot_path(file_path, digest):
+    directory = SNAPSHOT_DIR or os.path.join(os.path.dirname(os.path.abspath(file_path)), '.snapshots')
+    return os.path.join(directory, f"{os.path.basename(file_path)}.{digest}.feather")
+
+
+# Schema metadata key holding the in-memory size of the frame as parsed, before compact()
+PARSED_SIZE_KEY = b'parsed_memory_bytes'
+
+
+# (frame, parsed size in bytes or None) or None when the snapshot cannot be read
+def _read_snapshot(path):
+    try:
+        from pyarrow import feather
+        table = feather.read_table(path, memory_map=MEMORY_MAP)
+        # With memory mapping, columns without nulls are wrapped around the mapped buffers, not copied
+        frame = table.to_pandas(split_blocks=MEMORY_MAP)
+    except (ImportError, OSError, ValueError):
+        return None
+    parsed_size = (table.schema.metadata or {}).get(PARSED_SIZE_KEY)
+    return frame, int(parsed_size) if parsed_size is not None else None
+
+
+def _write_snapshot(frame, path, parsed_size):
+    directory = os.path.dirname(path)
+    try:
+        import pyarrow as pa
+        from pyarrow import feather
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), PARSED_SIZE_KEY: str(parsed_size).encode()})
+        # Uncompressed, so the file can be mapped without decoding it
+        feather.write_feather(table, temporary_path, compression='uncompressed')
+        os.replace(temporary_path, path)
+    except (ImportError, OSError, ValueError):
+        return
+
+    # Drop snapshots of older versions of the same file
+    prefix = os.path.basename(path).rsplit('.', 2)[0] + '.'
+    for name in os.listdir(directory):
+        stale = os.path.join(directory, name)
+        if name.startswith(prefix) and name.endswith('.feather') and stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def load_csv(file_path, snapshot=True, categorical=()):
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+
+    # The dtypes are part of the snapshot, so they are part of its key
+    digest = hashlib.sha256(raw + repr(sorted(categorical)).encode()).hexdigest()[:16]
+    cached_path = snapshot_path(file_path, digest)
+    if snapshot and os.path.exists(cached_path):
+        cached = _read_snapshot(cached_path)
+        if cached is not None:
+            frame, before = cached
+            _log_footprint(file_path, frame, before, 'snapshot')
+            return frame
+
+    text = repair_mojibake(decode(raw))
+    frame = drop_empty_columns(pd.read_csv(io.StringIO(text)))
+    before = memory_usage(frame)
+    frame = compact(frame, categorical)
+    _log_footprint(file_path, frame, before, 'CSV')
+
+    if snapshot:
+        _write_snapshot(frame, cached_path, before)
+    return frame
+
+
+def _log_footprint(file_path, frame, before, source):
+    after = memory_usage(frame) / 1024
+    if before is None:
+        logger.info("Loaded %s from %s: %d rows, %.1f KB in memory", os.path.basename(file_path), source,
+                    len(frame), after)
+    else:
+        logger.info("Loaded %s from %s: %d rows, %.1f KB -> %.1f KB in memory", os.path.basename(file_path), source,
+                    len(frame), before / 1024, after)
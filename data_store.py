@@ -0,0 +1,167 @@
+import logging
+import ntpath
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# In-memory store for the dashboard tables.
+# Each dataset is registered with its source files and a build function that
+# returns a dict of the loaded table plus everything derived from it (indexes,
+# parsed positions, scores). Reloads build a new dict in the background and swap
+# it in with a single assignment, so a request sees either the old or the new
+# data, never a mix of both.
+#
+# At startup the datasets are loaded concurrently in the background while the
+# server is already accepting connections; a request for a dataset that is still
+# loading waits on that dataset's lock rather than failing.
+logger = logging.getLogger(__name__)
+
+RELOAD_INTERVAL = float(os.environ.get('DATA_RELOAD_INTERVAL', '30'))
+# Directory to read the data files from instead of the paths hard-coded in the views
+DATA_DIR = os.environ.get('DASHBOARD_DATA_DIR')
+LOAD_WORKERS = int(os.environ.get('DATA_LOAD_WORKERS', '4'))
+
+
+def resolve_path(path):
+    if DATA_DIR is None:
+        return path
+    # ntpath splits both Windows and POSIX separators
+    return os.path.join(DATA_DIR, ntpath.basename(path))
+
+
+class Dataset:
+    def __init__(self, name, paths, build, resolve=True):
+        self.name = name
+        self.paths = [resolve_path(path) for path in paths] if resolve else list(paths)
+        self.build = build
+        self.bundle = None
+        self.version = 0
+        self.mtimes = None
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def current_mtimes(self):
+        return tuple(os.stat(path).st_mtime_ns for path in self.paths)
+
+    def _load(self, mtimes):
+        bundle = self.build(*self.paths)
+        bundle['version'] = self.version + 1
+        self.bundle = bundle
+        self.version = bundle['version']
+        self.mtimes = mtimes
+        return bundle
+
+    def get(self):
+        bundle = self.bundle
+        if bundle is None:
+            with self.lock:
+                bundle = self.bundle
+                if bundle is None:
+                    bundle = self._load(self.current_mtimes())
+        return bundle
+
+    def reload_if_changed(self):
+        with self.lock:
+            if self.bundle is None:
+                return False
+            try:
+                mtimes = self.current_mtimes()
+            except OSError:
+                # A file is being replaced; pick it up on the next pass
+                return False
+            if mtimes == self.mtimes:
+                return False
+            bundle = self._load(mtimes)
+        for listener in self.listeners:
+            listener(bundle)
+        return True
+
+
+_datasets = {}
+_watcher = None
+_preloader = None
+_ready = threading.Event()
+_load_error = None
+
+
+# resolve=False keeps the paths as given, ignoring DASHBOARD_DATA_DIR
+def register(name, paths, build, resolve=True):
+    _datasets[name] = Dataset(name, paths, build, resolve)
+
+
+def get(name):
+    return _datasets[name].get()
+
+
+def on_reload(name, listener):
+    _datasets[name].listeners.append(listener)
+
+
+def preload(max_workers=LOAD_WORKERS):
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='data-load') as executor:
+        futures = [executor.submit(dataset.get) for dataset in list(_datasets.values())]
+        for future in futures:
+            future.result()
+
+
+def _preload(on_ready):
+    global _load_error
+    started = time.perf_counter()
+    try:
+        preload()
+        logger.info("Loaded %d datasets in %.1fs", len(_datasets), time.perf_counter() - started)
+        for callback in on_ready:
+            callback()
+    except Exception as error:
+        # Requests keep loading the failed datasets on demand
+        _load_error = f"{type(error).__name__}: {error}"
+        logger.exception("Loading the datasets failed")
+        return
+    _ready.set()
+
+
+# Load every dataset in the background, then run the on_ready callbacks (e.g. cache warm-up)
+def start_preload(on_ready=()):
+    global _preloader
+    if _preloader is not None:
+        return
+    _preloader = threading.Thread(target=_preload, args=(list(on_ready),), name='data-preload', daemon=True)
+    _preloader.start()
+
+
+def readiness():
+    pending = [name for name, dataset in _datasets.items() if dataset.bundle is None]
+    return {
+        # After a failed preload, ready once requests have loaded everything on demand
+        'ready': _ready.is_set() or (_load_error is not None and not pending),
+        'loaded': [name for name, dataset in _datasets.items() if dataset.bundle is not None],
+        'pending': pending,
+        'error': _load_error,
+    }
+
+
+def reload_changed():
+    reloaded = []
+    for name, dataset in list(_datasets.items()):
+        try:
+            if dataset.reload_if_changed():
+                reloaded.append(name)
+        except Exception:
+            logger.exception("Reloading %s failed, keeping the previous data", name)
+    return reloaded
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        for name in reload_changed():
+            logger.info("Reloaded %s", name)
+
+
+def start_watcher(interval=RELOAD_INTERVAL):
+    global _watcher
+    if _watcher is not None or interval <= 0:
+        return
+    _watcher = threading.Thread(target=_watch, args=(interval,), name='data-reload', daemon=True)
+    _watcher.start()
@@ -0,0 +1,14 @@
+# Name-keyed row index shared by the dashboards.
+# Built once when a table is loaded so a dropdown selection is a dict lookup
+# instead of a boolean scan over the whole column.
+
+
+def build_index(data, column):
+    return dict(data.groupby(column, sort=False, observed=True).indices)
+
+
+def lookup(data, index, name):
+    positions = index.get(name)
+    if positions is None:
+        return data.iloc[0:0]
+    return data.iloc[positions]
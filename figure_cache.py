@@ -0,0 +1,69 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Bounded LRU cache for rendered dashboard outputs.
+# Keys are (dashboard, selected entity, data version) so a data reload never
+# serves figures built from the previous tables.
+DEFAULT_MAX_SIZE = int(os.environ.get('FIGURE_CACHE_SIZE', '256'))
+
+
+class FigureCache:
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Render outside the lock so a slow figure does not block other dashboards
+        value = render()
+        if self.max_size <= 0:
+            return value
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def warm_up(self, dashboard, names, version, render):
+        for name in names:
+            self.get_or_render((dashboard, name, version), lambda name=name: render(name))
+
+    def invalidate(self, dashboard=None):
+        with self._lock:
+            if dashboard is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == dashboard]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
+
+
+figure_cache = FigureCache()
+
+# Set FIGURE_CACHE_WARMUP=1 to pre-render every entity before serving
+WARM_UP = os.environ.get('FIGURE_CACHE_WARMUP', '0') == '1'
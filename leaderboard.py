@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from dash import dcc, html, callback
+from dash.dependencies import Input, Output
+from flask import jsonify, request
+
+import data_store
+
+# League-wide player leaderboard.
+# The per-player metrics shown on the player page are computed for every player
+# at once when the player table is loaded, together with league and per-team
+# percentiles and sort orders, so top-N and team queries only slice arrays.
+METRICS = {
+    'performance_score': 'Performance Score',
+    'goals_per_match': 'Goals per Match',
+    'pass_success_rate': 'Pass Success Rate',
+}
+DEFAULT_METRIC = 'performance_score'
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+
+
+# Player metrics for every row at once; dashbord1.render_dashboard reads them from the leaderboard table
+def calculate_player_metrics(data):
+    goals = data['goals'].to_numpy(dtype=float)
+    matches = data['Matches'].to_numpy(dtype=float)
+    total_passes = data['Total Passes'].to_numpy(dtype=float)
+    successful_passes = data['Successful Passes'].to_numpy(dtype=float)
+    minutes = data['Minutes Played'].to_numpy(dtype=float)
+
+    goals_per_match = np.divide(goals, matches, out=np.zeros_like(goals), where=matches > 0)
+    pass_success_rate = np.divide(successful_passes, total_passes, out=np.zeros_like(goals), where=total_passes > 0) * 100
+    performance_score = (goals * 2 + pass_success_rate * 0.5 + minutes / 500) / 10
+    return {
+        'goals_per_match': goals_per_match,
+        'pass_success_rate': pass_success_rate,
+        'performance_score': performance_score,
+    }
+
+
+def build_leaderboard(data):
+    metrics = calculate_player_metrics(data)
+    team_codes, teams = pd.factorize(data['player team'])
+    table = pd.DataFrame({
+        'player name': data['player name'].to_numpy(),
+        'player team': data['player team'].to_numpy(),
+        'Matches': data['Matches'].to_numpy(),
+    })
+
+    order = {}
+    team_order = {}
+    for metric, values in metrics.items():
+        column = pd.Series(values)
+        table[metric] = values
+        # Share of players with a value at or below this one
+        table[f"{metric}_league_percentile"] = column.rank(method='max', pct=True).to_numpy() * 100
+        table[f"{metric}_team_percentile"] = column.groupby(team_codes).rank(method='max', pct=True).to_numpy() * 100
+        order[metric] = np.argsort(-values, kind='stable')
+        # Rows grouped by team, best first within each team
+        team_order[metric] = np.lexsort((-values, team_codes))
+
+    sorted_codes = team_codes[team_order[DEFAULT_METRIC]]
+    return {
+        'table': table,
+        'order': order,
+        'team_order': team_order,
+        'team_offsets': np.searchsorted(sorted_codes, np.arange(len(teams) + 1)),
+        'teams': {team: code for code, team in enumerate(teams)},
+        'matches': table['Matches'].to_numpy(),
+    }
+
+
+def top_players(leaderboard, metric=DEFAULT_METRIC, limit=DEFAULT_LIMIT, team=None, min_matches=0):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {', '.join(METRICS)}")
+    # A negative limit would slice from the end of the order instead of the top
+    if limit < 0:
+        raise ValueError(f"limit must not be negative, got {limit}")
+    if min_matches < 0:
+        raise ValueError(f"min_matches must not be negative, got {min_matches}")
+    if team is None:
+        positions = leaderboard['order'][metric]
+    else:
+        code = leaderboard['teams'].get(team)
+        if code is None:
+            return leaderboard['table'].iloc[0:0]
+        offsets = leaderboard['team_offsets']
+        positions = leaderboard['team_order'][metric][offsets[code]:offsets[code + 1]]
+    if min_matches:
+        positions = positions[leaderboard['matches'][positions] >= min_matches]
+    return leaderboard['table'].iloc[positions[:limit]]
+
+
+def _leaderboard():
+    return data_store.get('players')['leaderboard']
+
+
+def serve_layout():
+    teams = sorted(_leaderboard()['teams'])
+    dropdown_style = {'width': '300px', 'display': 'inline-block', 'marginRight': '10px'}
+    return html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
+        html.H1('laliga Player Leaderboard', style={'color': '#ffffff', 'textAlign': 'center'}),
+        html.Div([
+            dcc.Dropdown(
+                id='leaderboard-metric',
+                options=[{'label': label, 'value': metric} for metric, label in METRICS.items()],
+                value=DEFAULT_METRIC,
+                clearable=False,
+                style=dropdown_style
+            ),
+            dcc.Dropdown(
+                id='leaderboard-team',
+                options=[{'label': team, 'value': team} for team in teams],
+                placeholder='All teams',
+                style=dropdown_style
+            ),
+            dcc.Input(id='leaderboard-min-matches', type='number', min=0, value=0, placeholder='Min. matches'),
+        ]),
+        html.Div(id='leaderboard-table', style={'color': '#ffffff'}),
+    ])
+
+
+@callback(
+    Output('leaderboard-table', 'children'),
+    Input('leaderboard-metric', 'value'),
+    Input('leaderboard-team', 'value'),
+    Input('leaderboard-min-matches', 'value')
+)
+def update_leaderboard(metric, team, min_matches):
+    metric = metric or DEFAULT_METRIC
+    rows = top_players(_leaderboard(), metric, DEFAULT_LIMIT, team, max(min_matches or 0, 0))
+    header = ['#', 'Player', 'Team', METRICS[metric], 'League percentile', 'Team percentile']
+    body = [
+        html.Tr([
+            html.Td(rank),
+            html.Td(row['player name']),
+            html.Td(row['player team']),
+            html.Td(f"{row[metric]:.2f}"),
+            html.Td(f"{row[metric + '_league_percentile']:.0f}"),
+            html.Td(f"{row[metric + '_team_percentile']:.0f}"),
+        ])
+        for rank, row in enumerate(rows.to_dict('records'), start=1)
+    ]
+    return html.Table([html.Thead(html.Tr([html.Th(title) for title in header])), html.Tbody(body)],
+                      className='table table-dark table-sm')
+
+
+def init_app(app):
+    # GET /api/leaderboard?metric=goals_per_match&team=Real%20Madrid&limit=10&min_matches=5
+    @app.server.route('/api/leaderboard')
+    def leaderboard_api():
+        metric = request.args.get('metric', DEFAULT_METRIC)
+        try:
+            limit = min(int(request.args.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+            min_matches = int(request.args.get('min_matches', 0))
+            rows = top_players(_leaderboard(), metric, limit, request.args.get('team'), min_matches)
+        except ValueError as error:
+            return jsonify({'error': str(error)}), 400
+        return jsonify({'metric': metric, 'players': rows.to_dict('records')})
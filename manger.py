@@ -1,67 +1,68 @@
-import pandas as pd
-import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash import Patch, dcc, html, callback, no_update
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
+from flask import jsonify, request
 import plotly.express as px
 import plotly.graph_objects as go
-from waitress import serve
+from data_loader import load_csv
+from entity_index import build_index
+from figure_cache import figure_cache
+import data_store
+from search_index import build_search_index, dropdown_option, search_options
+from coach_metrics import build_ranking, coach_records, rank_coach
 
 # تحميل بيانات المدربين
 file_path_coaches = 'C:\\Users\\CONNECT\\OneDrive\\Desktop\\project_dashbord\\la_liga_managers_2024.csv'
-try:
-    coach_data = pd.read_csv(file_path_coaches, encoding='utf-8')
-except UnicodeDecodeError:
-    try:
-        coach_data = pd.read_csv(file_path_coaches, encoding='ISO-8859-1')
-    except UnicodeDecodeError:
-        try:
-            coach_data = pd.read_csv(file_path_coaches, encoding='latin1')
-        except UnicodeDecodeError:
-            with open(file_path_coaches, 'rb') as file:
-                import chardet
-                result = chardet.detect(file.read())
-                encoding = result['encoding']
-                coach_data = pd.read_csv(file_path_coaches, encoding=encoding)
-
-# إعداد تطبيق Dash
-external_stylesheets = [
-    {
-        'href': 'https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css',
-        'rel': 'stylesheet',
-        'integrity': 'sha384-B4gt1jrGC7Jh4AgTPSdUtOBvfO8sh+wyZ3B/cEYLxtY0QoZsibTNF5IT8+9ePLZB',
-        'crossorigin': 'anonymous'
-    },
-    {
-        'href': 'https://fonts.googleapis.com/css2?family=Roboto&display=swap',
-        'rel': 'stylesheet'
+
+# أعمدة نصية متكررة تخزن كفئات لتقليل الذاكرة
+COACH_CATEGORICAL_COLUMNS = ['Manager', 'Team', 'Goalkeeper', 'Defenders', 'Midfielders', 'Forwards']
+
+# تحميل البيانات مع الفهرس وجدول الترتيب، ويعاد بناؤها عند تغير الملف
+def load_coach_data(file_path_coaches):
+    coach_data = load_csv(file_path_coaches, categorical=COACH_CATEGORICAL_COLUMNS)
+    return {
+        'data': coach_data,
+        'index': build_index(coach_data, 'Manager'),
+        'ranking': build_ranking(coach_data),
+        'search': build_search_index(coach_data['Manager']),
     }
-]
 
-app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+data_store.register('coaches', [file_path_coaches], load_coach_data)
+def clear_coach_figures(coaches):
+    figure_cache.invalidate('coach')
+    figure_cache.invalidate('coach-ranking')
 
-# واجهة المستخدم لتطبيق Dash
-app.layout = html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
-    html.H1('La Liga Coach Statistics Dashboard', style={'color': '#ffffff', 'textAlign': 'center'}),
-    
-    dcc.Dropdown(
-        id='coach-dropdown',
-        options=[{'label': manager, 'value': manager} for manager in coach_data['Manager'].unique()],
-        value=coach_data['Manager'].unique()[0],
-        style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff', 'marginTop': '20px'}
-    ),
-    html.Div(id='coach-data', style={'color': '#ffffff'}),
-    dcc.Graph(id='win-rate-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='goals-per-match-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='offensive-performance-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='defensive-performance-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='overall-performance-graph', style={'backgroundColor': '#1e1e1e'}),
-    dcc.Graph(id='ranking-graph', style={'backgroundColor': '#1e1e1e'}),
-    html.Div(id='preferred-formation', style={'color': '#ffffff'})
-])
+data_store.on_reload('coaches', clear_coach_figures)
+
+# واجهة المستخدم لتطبيق Dash (تبنى عند كل تحميل للصفحة لتظهر البيانات المحدثة)
+def serve_layout():
+    coaches = data_store.get('coaches')
+    coach_data = coaches['data']
+    return html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
+        html.H1('La Liga Coach Statistics Dashboard', style={'color': '#ffffff', 'textAlign': 'center'}),
+
+        dcc.Dropdown(
+            id='coach-dropdown',
+            options=[dropdown_option(coach_data['Manager'].iloc[0])],
+            value=coach_data['Manager'].iloc[0],
+            placeholder='Type to search',
+            style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff', 'marginTop': '20px'}
+        ),
+        html.Div(id='coach-data', style={'color': '#ffffff'}),
+        dcc.Graph(id='win-rate-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='coach-goals-per-match-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='offensive-performance-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='defensive-performance-graph', style={'backgroundColor': '#1e1e1e'}),
+        dcc.Graph(id='overall-performance-graph', style={'backgroundColor': '#1e1e1e'}),
+        # الرسم الكامل يرسل مرة واحدة مع الصفحة، وبعدها يرسل فقط تمييز المدرب المختار
+        dcc.Graph(id='ranking-graph', figure=get_ranking_figure(coaches), style={'backgroundColor': '#1e1e1e'}),
+        # إصدار البيانات التي رسم منها ترتيب الأعمدة في الصفحة
+        dcc.Store(id='ranking-version', data=coaches['version']),
+        html.Div(id='coach-preferred-formation', style={'color': '#ffffff'})
+    ])
 
 # دالة لتحليل إحصائيات المدربين
-def get_coach_statistics(selected_coach):
-    coach_data_selected = coach_data[coach_data['Manager'] == selected_coach].iloc[0]
+def get_coach_statistics(coach_data_selected):
     coach_stats = [
         html.P(f"Manager: {coach_data_selected['Manager']}"),
         html.P(f"Team: {coach_data_selected['Team']}"),
@@ -76,83 +77,57 @@ def get_coach_statistics(selected_coach):
 
     return coach_stats
 
-# دالة لحساب نسبة الفوز
-def calculate_win_rate(coach_data_selected):
-    matches = coach_data_selected['Matches']
-    wins = coach_data_selected['Wins']
-    if matches > 0:
-        win_rate = (wins / matches) * 100
-    else:
-        win_rate = 0
-    return win_rate
-
-# دالة لحساب متوسط الأهداف المسجلة والمستقبلة لكل مباراة
-def calculate_goals_per_match(coach_data_selected):
-    matches = coach_data_selected['Matches']
-    goals_scored = coach_data_selected['Goals Scored']
-    goals_conceded = coach_data_selected['Goals Conceded']
-    if matches > 0:
-        goals_scored_per_match = goals_scored / matches
-        goals_conceded_per_match = goals_conceded / matches
-    else:
-        goals_scored_per_match = 0
-        goals_conceded_per_match = 0
-    return goals_scored_per_match, goals_conceded_per_match
-
-# دالة لتقييم الأداء الهجومي
-def calculate_offensive_performance(goals_scored_per_match):
-    if goals_scored_per_match > 1.5:
-        offensive_score = 6 + (goals_scored_per_match - 1.5) * 2.67
-    else:
-        offensive_score = 6 * (goals_scored_per_match / 1.5)
-    offensive_score = min(offensive_score, 10)
-    return offensive_score
-
-# دالة لتقييم الأداء الدفاعي
-def calculate_defensive_performance(goals_conceded_per_match):
-    if goals_conceded_per_match < 1.5:
-        defensive_score = 5 + (1.5 - goals_conceded_per_match) * 3.33
-    else:
-        defensive_score = 5 - (goals_conceded_per_match - 1.5) * 3.33
-    defensive_score = max(defensive_score, 0)
-    return defensive_score
-
-# دالة لتقييم الأداء العام للمدرب
-def calculate_overall_performance(win_rate, offensive_score, defensive_score):
-    overall_score = (win_rate * 0.4 + offensive_score * 0.3 + defensive_score * 0.3) / 10
-    return overall_score
+# جدول الترتيب يحسب مرة واحدة ويعاد حسابه فقط عند تغير البيانات
+_ranking_table = None
+
+def get_ranking(coach_data):
+    global _ranking_table
+    ranking_table = _ranking_table
+    if ranking_table is None or ranking_table['source'] is not coach_data:
+        ranking_table = build_ranking(coach_data)
+        _ranking_table = ranking_table
+    return ranking_table
 
 # دالة لعرض ترتيب المدرب
 def calculate_ranking(coach_data, selected_coach):
-    coach_data['Win Rate'] = coach_data.apply(lambda row: (row['Wins'] / row['Matches']) * 100 if row['Matches'] > 0 else 0, axis=1)
-    coach_data['Goals per Match'] = coach_data.apply(lambda row: row['Goals Scored'] / row['Matches'] if row['Matches'] > 0 else 0, axis=1)
-    coach_data['Offensive Score'] = coach_data.apply(lambda row: calculate_offensive_performance(row['Goals per Match']), axis=1)
-    coach_data['Defensive Score'] = coach_data.apply(lambda row: calculate_defensive_performance(row['Goals Conceded'] / row['Matches'] if row['Matches'] > 0 else 0), axis=1)
-    coach_data['Overall Score'] = coach_data.apply(lambda row: calculate_overall_performance(row['Win Rate'], row['Offensive Score'], row['Defensive Score']), axis=1)
+    return rank_coach(get_ranking(coach_data), selected_coach)
 
-    selected_coach_score = coach_data[coach_data['Manager'] == selected_coach]['Overall Score'].values[0]
-    ranking = coach_data[coach_data['Overall Score'] >= selected_coach_score].shape[0]
-
-    return ranking, coach_data.sort_values(by='Overall Score', ascending=False)
+# البحث في أسماء المدربين على الخادم بدلا من إرسال جميع الأسماء مع الصفحة
+@callback(
+    Output('coach-dropdown', 'options'),
+    Input('coach-dropdown', 'search_value'),
+    State('coach-dropdown', 'value')
+)
+def update_coach_options(search_value, selected_coach):
+    if not search_value:
+        raise PreventUpdate
+    return search_options(data_store.get('coaches')['search'], search_value, selected_coach)
 
 # تعريف الكول باك لتحديث البيانات
-@app.callback(
+@callback(
     Output('coach-data', 'children'),
     Output('win-rate-graph', 'figure'),
-    Output('goals-per-match-graph', 'figure'),
+    Output('coach-goals-per-match-graph', 'figure'),
     Output('offensive-performance-graph', 'figure'),
     Output('defensive-performance-graph', 'figure'),
     Output('overall-performance-graph', 'figure'),
-    Output('ranking-graph', 'figure'),
-    Output('preferred-formation', 'children'),
+    Output('coach-preferred-formation', 'children'),
     Input('coach-dropdown', 'value')
 )
 def update_dashboard(selected_coach):
-    coach_data_selected = coach_data[coach_data['Manager'] == selected_coach].iloc[0]
+    coaches = data_store.get('coaches')
+    return figure_cache.get_or_render(('coach', selected_coach, coaches['version']), lambda: render_dashboard(coaches, selected_coach))
+
+# بناء الرسوم البيانية للمدرب المختار من مقاييسه المحسوبة مسبقا لجميع المدربين
+def render_dashboard(coaches, selected_coach):
+    return render_coach(coach_records(coaches['ranking'], coaches['index'], [selected_coach])[0])
 
-    coach_stats = get_coach_statistics(selected_coach)
+# مرحلة العرض: تحويل سجل مقاييس مدرب واحد إلى رسوم بيانية، بدون حسابات أو آثار جانبية
+# (تستخدمها الكول باك والتقارير وأي واجهة برمجية)
+def render_coach(coach_data_selected):
+    coach_stats = get_coach_statistics(coach_data_selected)
     
-    win_rate = calculate_win_rate(coach_data_selected)
+    win_rate = coach_data_selected['Win Rate']
     win_rate_fig = px.pie(
     values=[win_rate, 100 - win_rate],
     names=['Win Rate', ''],
@@ -171,14 +146,15 @@ def update_dashboard(selected_coach):
     #تغيير لون الشريط
 
     
-    goals_scored_per_match, goals_conceded_per_match = calculate_goals_per_match(coach_data_selected)
+    goals_scored_per_match = coach_data_selected['Goals per Match']
+    goals_conceded_per_match = coach_data_selected['Conceded per Match']
     goals_per_match_fig = go.Figure(data=[
         go.Bar(name='Goals Scored per Match', x=['Goals per Match'], y=[goals_scored_per_match], marker_color='green'),
         go.Bar(name='Goals Conceded per Match', x=['Goals per Match'], y=[goals_conceded_per_match], marker_color='red')
     ])
     goals_per_match_fig.update_layout(barmode='group', title='Goals per Match', template='plotly_dark')
     
-    offensive_performance = calculate_offensive_performance(goals_scored_per_match)
+    offensive_performance = coach_data_selected['Offensive Score']
     offensive_performance_fig = go.Figure(go.Indicator(
     mode='gauge+number',
     value=offensive_performance,
@@ -189,7 +165,7 @@ def update_dashboard(selected_coach):
     offensive_performance_fig.update_layout(paper_bgcolor='#1e1e1e')
 
     # عرض الرسم البياني
-    defensive_performance = calculate_defensive_performance(goals_conceded_per_match)
+    defensive_performance = coach_data_selected['Defensive Score']
 
     defensive_performance_fig = go.Figure(go.Indicator(
         mode="gauge+number",
@@ -214,11 +190,8 @@ def update_dashboard(selected_coach):
         margin=dict(l=20, r=20, t=50, b=20),
     )
 
-# عرض الشكل البياني
-    defensive_performance_fig.show()
-
     
-    overall_performance = calculate_overall_performance(win_rate, offensive_performance, defensive_performance)
+    overall_performance = coach_data_selected['Overall Score']
     overall_performance_fig = px.bar(
         x=['Overall Performance'],
         y=[overall_performance],
@@ -227,15 +200,6 @@ def update_dashboard(selected_coach):
         template='plotly_dark'
     )
     
-    ranking, sorted_coach_data = calculate_ranking(coach_data, selected_coach)
-    ranking_fig = px.bar(
-        x=sorted_coach_data['Manager'],
-        y=sorted_coach_data['Overall Score'],
-        labels={'x': 'Manager', 'y': 'Overall Score'},
-        title='Coach Rankings',
-        template='plotly_dark'
-    )
-    
     formation = html.Div([
         html.P(f"Goalkeeper: {coach_data_selected['Goalkeeper']}"),
         html.P(f"Defenders: {coach_data_selected['Defenders']}"),
@@ -243,7 +207,67 @@ def update_dashboard(selected_coach):
         html.P(f"Forwards: {coach_data_selected['Forwards']}")
     ])
     
-    return coach_stats, win_rate_fig, goals_per_match_fig, offensive_performance_fig, defensive_performance_fig, overall_performance_fig, ranking_fig, formation
+    return coach_stats, win_rate_fig, goals_per_match_fig, offensive_performance_fig, defensive_performance_fig, overall_performance_fig, formation
+
+# رسم ترتيب جميع المدربين، يبنى مرة واحدة لكل نسخة من البيانات
+def render_ranking(coaches):
+    sorted_coach_data = coaches['ranking']['sorted']
+    ranking_fig = px.bar(
+        x=sorted_coach_data['Manager'],
+        y=sorted_coach_data['Overall Score'],
+        labels={'x': 'Manager', 'y': 'Overall Score'},
+        title='Coach Rankings',
+        template='plotly_dark'
+    )
+    ranking_fig.update_traces(selected={'marker': {'color': '#05ab92'}}, unselected={'marker': {'opacity': 0.4}})
+    return ranking_fig
+
+def get_ranking_figure(coaches):
+    return figure_cache.get_or_render(('coach-ranking', None, coaches['version']), lambda: render_ranking(coaches))
+
+def ranking_title(ranking, selected_coach):
+    return f"Coach Rankings ({selected_coach}: #{ranking})"
+
+# تمييز المدرب المختار في رسم الترتيب: يرسل التغيير فقط بدلا من الرسم كاملا
+# إذا أعيد تحميل البيانات بعد فتح الصفحة تغير ترتيب الأعمدة، فيرسل الرسم كاملا من الإصدار الجديد
+@callback(
+    Output('ranking-graph', 'figure'),
+    Output('ranking-version', 'data'),
+    Input('coach-dropdown', 'value'),
+    State('ranking-version', 'data')
+)
+def update_ranking_highlight(selected_coach, page_version):
+    coaches = data_store.get('coaches')
+    position = coaches['ranking']['position_by_manager'].get(selected_coach)
+    if position is None:
+        raise PreventUpdate
+    if page_version != coaches['version']:
+        return render_highlighted_ranking(coaches, selected_coach), coaches['version']
+    ranking, _ = rank_coach(coaches['ranking'], selected_coach)
+    patch = Patch()
+    patch['data'][0]['selectedpoints'] = [position]
+    patch['layout']['title']['text'] = ranking_title(ranking, selected_coach)
+    return patch, no_update
+
+# رسم الترتيب كاملا مع تمييز المدرب، للتقارير وللصفحات المفتوحة قبل إعادة تحميل البيانات
+def render_highlighted_ranking(coaches, selected_coach):
+    ranking, _ = rank_coach(coaches['ranking'], selected_coach)
+    ranking_fig = go.Figure(get_ranking_figure(coaches))
+    ranking_fig.update_traces(selectedpoints=[coaches['ranking']['position_by_manager'][selected_coach]])
+    ranking_fig.update_layout(title_text=ranking_title(ranking, selected_coach))
+    return ranking_fig
+
+# رسم جميع المدربين مسبقا قبل تشغيل الخادم (FIGURE_CACHE_WARMUP=1)
+def warm_up_cache():
+    coaches = data_store.get('coaches')
+    figure_cache.warm_up('coach', coaches['data']['Manager'].unique(), coaches['version'],
+                         lambda name: render_dashboard(coaches, name))
 
-if __name__ == '__main__':
-    serve(app.server, host='0.0.0.0', port=8000)
+# واجهة برمجية لمقاييس المدربين من نفس طبقة الحساب
+def init_app(app):
+    # GET /api/coaches?name=Diego%20Simeone&name=Xavi%20Hern%C3%A1ndez (جميع المدربين بدون name)
+    @app.server.route('/api/coaches')
+    def coaches_api():
+        coaches = data_store.get('coaches')
+        names = request.args.getlist('name') or None
+        return jsonify({'coaches': coach_records(coaches['ranking'], coaches['index'], names)})
@@ -0,0 +1,166 @@
+import cProfile
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, request
+
+from figure_cache import figure_cache
+
+# Per-callback latency and response size for the Dash server, exported in the
+# Prometheus text format on /metrics.
+# Every Dash callback is a POST to /_dash-update-component, so the Flask request
+# hooks see all of them; the callback is named after the Python function that
+# serves the requested outputs (e.g. dashbord1.update_dashboard).
+#
+# With METRICS_PROFILING=1 a request sent with the "X-Profile: 1" header (or
+# ?profile=1) is run under cProfile and the stats are written to PROFILE_DIR.
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+PAYLOAD_BUCKETS = [1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000]
+PROFILING = os.environ.get('METRICS_PROFILING', '0') == '1'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+CALLBACK_PATH = '/_dash-update-component'
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ['+Inf'], self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.total}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class CallbackMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.payload = {}
+        self.errors = {}
+
+    def observe(self, callback, seconds, payload_bytes, failed):
+        with self._lock:
+            if callback not in self.latency:
+                self.latency[callback] = Histogram(LATENCY_BUCKETS)
+                self.payload[callback] = Histogram(PAYLOAD_BUCKETS)
+                self.errors[callback] = 0
+            self.latency[callback].observe(seconds)
+            self.payload[callback].observe(payload_bytes)
+            if failed:
+                self.errors[callback] += 1
+
+    def render(self):
+        lines = [
+            '# HELP dash_callback_latency_seconds Time spent serving a Dash callback.',
+            '# TYPE dash_callback_latency_seconds histogram',
+        ]
+        with self._lock:
+            callbacks = sorted(self.latency)
+            for callback in callbacks:
+                lines.extend(self.latency[callback].lines('dash_callback_latency_seconds', _label(callback)))
+            lines += [
+                '# HELP dash_callback_response_bytes Size of the callback response body.',
+                '# TYPE dash_callback_response_bytes histogram',
+            ]
+            for callback in callbacks:
+                lines.extend(self.payload[callback].lines('dash_callback_response_bytes', _label(callback)))
+            lines += [
+                '# HELP dash_callback_errors_total Callback requests that returned an error status.',
+                '# TYPE dash_callback_errors_total counter',
+            ]
+            lines += [f"dash_callback_errors_total{{{_label(callback)}}} {self.errors[callback]}" for callback in callbacks]
+
+        stats = figure_cache.stats()
+        lines += [
+            '# HELP figure_cache_hits_total Figure cache lookups served from the cache.',
+            '# TYPE figure_cache_hits_total counter',
+            f"figure_cache_hits_total {stats['hits']}",
+            '# HELP figure_cache_misses_total Figure cache lookups that rendered the figures.',
+            '# TYPE figure_cache_misses_total counter',
+            f"figure_cache_misses_total {stats['misses']}",
+            '# HELP figure_cache_evictions_total Entries evicted to respect the size limit.',
+            '# TYPE figure_cache_evictions_total counter',
+            f"figure_cache_evictions_total {stats['evictions']}",
+            '# HELP figure_cache_entries Entries currently in the figure cache.',
+            '# TYPE figure_cache_entries gauge',
+            f"figure_cache_entries {stats['size']}",
+            '# HELP figure_cache_hit_ratio Share of figure cache lookups served from the cache.',
+            '# TYPE figure_cache_hit_ratio gauge',
+            f"figure_cache_hit_ratio {stats['hit_rate']}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def _label(callback):
+    escaped = callback.replace('\\', '\\\\').replace('"', '\\"')
+    return f'callback="{escaped}"'
+
+
+callback_metrics = CallbackMetrics()
+
+
+# Only names of registered callbacks become label values; anything else a client
+# posts shares one label, so the number of series stays bounded
+UNKNOWN_CALLBACK = 'unknown'
+
+
+def _callback_name(app):
+    body = request.get_json(silent=True)
+    output = body.get('output') if isinstance(body, dict) else None
+    callback = app.callback_map.get(output, {}).get('callback') if isinstance(output, str) else None
+    if callback is None:
+        return UNKNOWN_CALLBACK
+    return f"{callback.__module__}.{callback.__name__}"
+
+
+def _profile_requested():
+    return PROFILING and (request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1')
+
+
+def init_app(app):
+    server = app.server
+
+    @server.before_request
+    def start_timer():
+        if request.path != CALLBACK_PATH:
+            return
+        g.metrics_started = time.perf_counter()
+        if _profile_requested():
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @server.after_request
+    def record_callback(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{threading.get_ident()}.prof")
+            profiler.dump_stats(path)
+            response.headers['X-Profile-File'] = path
+
+        payload_bytes = response.calculate_content_length() or 0
+        callback_metrics.observe(_callback_name(app), elapsed, payload_bytes, response.status_code >= 400)
+        return response
+
+    @server.route('/metrics')
+    def metrics():
+        return Response(callback_metrics.render(), mimetype='text/plain; version=0.0.4')
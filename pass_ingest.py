@@ -0,0 +1,162 @@
+import argparse
+import io
+import os
+import pickle
+
+import pandas as pd
+
+# Incremental ingest of event-level pass logs into the per-player summary table
+# that dashbord1.py reads (players_statistics.csv).
+#
+# Each event log is a CSV with one row per pass:
+#   player name, player team, match id, minute, start x, start y, end x, end y, successful
+# Files are read in bounded chunks of lines and folded into running per-player
+# totals. The byte offset reached in every file is kept with the totals, so
+# re-running on a log that has grown only reads the new events.
+EVENT_COLUMNS = ['player name', 'player team', 'match id', 'minute',
+                 'start x', 'start y', 'end x', 'end y', 'successful']
+SUM_COLUMNS = ['Total Passes', 'Successful Passes', 'start x', 'start y', 'end x', 'end y']
+SUMMARY_COLUMNS = ['player name', 'player team', 'Matches', 'goals', 'Minutes Played',
+                   'Total Passes', 'Successful Passes', 'Pass Start Position', 'Pass End Position']
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class PassAggregator:
+    def __init__(self):
+        self.totals = pd.DataFrame(columns=SUM_COLUMNS, dtype=float)
+        self.teams = pd.Series(dtype=object)
+        # Latest minute seen per (player, match): minutes played and matches come from these
+        self.match_minutes = pd.Series(dtype=float)
+        self.offsets = {}
+        self.headers = {}
+
+    def update(self, events):
+        missing = set(EVENT_COLUMNS) - set(events.columns)
+        if missing:
+            raise ValueError(f"Pass events are missing columns: {', '.join(sorted(missing))}")
+        if events.empty:
+            return
+
+        chunk = pd.DataFrame({
+            'Total Passes': 1.0,
+            'Successful Passes': events['successful'].astype(float),
+            'start x': events['start x'].astype(float),
+            'start y': events['start y'].astype(float),
+            'end x': events['end x'].astype(float),
+            'end y': events['end y'].astype(float),
+        }).groupby(events['player name'].to_numpy()).sum()
+        self.totals = chunk if self.totals.empty else self.totals.add(chunk, fill_value=0)
+
+        teams = events.groupby('player name')['player team'].last()
+        self.teams = teams if self.teams.empty else teams.combine_first(self.teams)
+
+        minutes = events.groupby(['player name', 'match id'])['minute'].max().astype(float)
+        if self.match_minutes.empty:
+            self.match_minutes = minutes
+        else:
+            self.match_minutes = pd.concat([self.match_minutes, minutes]).groupby(level=[0, 1]).max()
+
+    def ingest(self, file_path, chunksize=DEFAULT_CHUNKSIZE):
+        key = os.path.abspath(file_path)
+        offset = self.offsets.get(key, 0)
+        if offset > os.path.getsize(file_path):
+            raise ValueError(f"{file_path} is shorter than when it was last ingested; it was replaced, not appended to")
+
+        with open(file_path, 'rb') as file:
+            file.seek(offset)
+            if offset == 0:
+                header = file.readline()
+                if not header.endswith(b'\n'):
+                    return 0
+                self.headers[key] = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+                offset = file.tell()
+
+            ingested = 0
+            lines = []
+            for line in file:
+                # A trailing line without a newline is still being written; leave it for the next run
+                if not line.endswith(b'\n'):
+                    break
+                lines.append(line)
+                if len(lines) >= chunksize:
+                    ingested += self._ingest_lines(key, lines)
+                    offset += sum(len(line) for line in lines)
+                    self.offsets[key] = offset
+                    lines = []
+            if lines:
+                ingested += self._ingest_lines(key, lines)
+                offset += sum(len(line) for line in lines)
+            self.offsets[key] = offset
+        return ingested
+
+    def _ingest_lines(self, key, lines):
+        events = pd.read_csv(io.BytesIO(b''.join(lines)), header=None, names=self.headers[key])
+        self.update(events)
+        return len(events)
+
+    def summary(self, goals=None):
+        totals = self.totals
+        passes = totals['Total Passes'].where(totals['Total Passes'] > 0)
+        minutes = self.match_minutes.groupby(level=0)
+        summary = pd.DataFrame({
+            'player name': totals.index,
+            'player team': self.teams.reindex(totals.index).to_numpy(),
+            'Matches': minutes.size().reindex(totals.index, fill_value=0).to_numpy(),
+            'goals': 0,
+            'Minutes Played': minutes.sum().reindex(totals.index, fill_value=0).round().astype(int).to_numpy(),
+            'Total Passes': totals['Total Passes'].astype(int).to_numpy(),
+            'Successful Passes': totals['Successful Passes'].astype(int).to_numpy(),
+            'Pass Start Position': _format_positions(totals['start x'] / passes, totals['start y'] / passes),
+            'Pass End Position': _format_positions(totals['end x'] / passes, totals['end y'] / passes),
+        }, columns=SUMMARY_COLUMNS)
+        if goals is not None:
+            summary['goals'] = summary['player name'].map(goals).fillna(0).astype(int)
+        return summary
+
+    def save(self, state_path):
+        temporary_path = f"{state_path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(self, file)
+        os.replace(temporary_path, state_path)
+
+    @staticmethod
+    def load(state_path):
+        if not os.path.exists(state_path):
+            return PassAggregator()
+        with open(state_path, 'rb') as file:
+            return pickle.load(file)
+
+
+# Average pass positions in the "(x, y)" form used by players_statistics.csv
+def _format_positions(x, y):
+    return [f"({start:.1f}, {end:.1f})" for start, end in zip(x.fillna(0).to_numpy(), y.fillna(0).to_numpy())]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fold pass event logs into the player summary table.')
+    parser.add_argument('event_files', nargs='+', help='pass event CSV files, one row per pass')
+    parser.add_argument('--state', default='pass_ingest_state.pkl', help='running totals kept between runs')
+    parser.add_argument('--output', default='players_statistics.csv', help='player summary CSV to write')
+    parser.add_argument('--goals-from', help='existing player summary CSV to take the goals column from')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='events parsed per chunk')
+    args = parser.parse_args(argv)
+
+    aggregator = PassAggregator.load(args.state)
+    for event_file in args.event_files:
+        ingested = aggregator.ingest(event_file, args.chunksize)
+        print(f"{event_file}: {ingested} new passes")
+    aggregator.save(args.state)
+
+    goals = None
+    if args.goals_from:
+        from data_loader import load_csv
+        goals = load_csv(args.goals_from, snapshot=False).groupby('player name')['goals'].sum()
+
+    # Write next to the target and swap it in, so the dashboards never reload a half-written file
+    temporary_path = f"{args.output}.tmp"
+    aggregator.summary(goals).to_csv(temporary_path, index=False)
+    os.replace(temporary_path, args.output)
+
+
+if __name__ == '__main__':
+    main()
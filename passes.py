@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Pass positions are stored as "(x, y)" strings in the CSV
+POSITION_PATTERN = r'^\s*\(\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)\s*,\s*([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)\s*\)\s*$'
+
+
+# Parse a column of "(x, y)" strings into an (n, 2) float32 array, once at load time
+def parse_positions(column):
+    coordinates = column.astype(str).str.extract(POSITION_PATTERN)
+    malformed = coordinates.isna().any(axis=1).to_numpy()
+    if malformed.any():
+        rows = np.flatnonzero(malformed)
+        examples = ', '.join(f"row {row}: {column.iloc[row]!r}" for row in rows[:5])
+        raise ValueError(f"Malformed coordinates in '{column.name}' ({len(rows)} rows), e.g. {examples}")
+    return np.ascontiguousarray(coordinates.to_numpy(dtype=np.float32))
+
+
+# Pitch size in field units and the density grid (columns x rows), e.g. PASS_GRID=21x14
+def _parse_size(value):
+    columns, rows = value.lower().split('x')
+    return float(columns), float(rows)
+
+
+PITCH_SIZE = _parse_size(os.environ.get('PITCH_SIZE', '105x68'))
+PASS_GRID = tuple(int(size) for size in _parse_size(os.environ.get('PASS_GRID', '21x14')))
+
+
+# Flat grid cell for every (x, y) position; points off the pitch go to the edge cells
+def bin_positions(positions, grid=PASS_GRID, pitch=PITCH_SIZE):
+    columns, rows = grid
+    x = np.floor(positions[:, 0] / pitch[0] * columns).astype(np.int64)
+    y = np.floor(positions[:, 1] / pitch[1] * rows).astype(np.int64)
+    return np.clip(y, 0, rows - 1) * columns + np.clip(x, 0, columns - 1)
+
+
+# Per-group cell counts stored sparsely: the non-empty cells of group g are
+# cells[offsets[g]:offsets[g + 1]] with matching counts
+def _group_counts(codes, n_groups, cells, n_cells):
+    keys, counts = np.unique(codes * n_cells + cells, return_counts=True)
+    offsets = np.searchsorted(keys // n_cells, np.arange(n_groups + 1))
+    return {'cells': keys % n_cells, 'counts': counts, 'offsets': offsets}
+
+
+# Bin every pass once at load time and keep the counts per player
+def build_pass_density(names, start_positions, end_positions, grid=PASS_GRID, pitch=PITCH_SIZE):
+    codes, groups = pd.factorize(names)
+    valid = codes >= 0
+    codes = codes[valid].astype(np.int64)
+    n_cells = grid[0] * grid[1]
+    return {
+        'grid': grid,
+        'pitch': pitch,
+        'groups': {name: code for code, name in enumerate(groups)},
+        'start': _group_counts(codes, len(groups), bin_positions(start_positions[valid], grid, pitch), n_cells),
+        'end': _group_counts(codes, len(groups), bin_positions(end_positions[valid], grid, pitch), n_cells),
+    }
+
+
+# Dense rows x columns grid for one player; kind is 'start', 'end' or 'both'
+def density_grid(density, name, kind='both'):
+    columns, rows = density['grid']
+    grid = np.zeros(rows * columns, dtype=np.int64)
+    group = density['groups'].get(name)
+    if group is not None:
+        for part in (('start', 'end') if kind == 'both' else (kind,)):
+            counts = density[part]
+            start, stop = counts['offsets'][group], counts['offsets'][group + 1]
+            grid[counts['cells'][start:stop]] += counts['counts'][start:stop]
+    return grid.reshape(rows, columns)
+
+
+# Centre of each grid column and row in field units, for the heatmap axes
+def cell_centres(density):
+    (columns, rows), (length, width) = density['grid'], density['pitch']
+    return (np.arange(columns) + 0.5) * length / columns, (np.arange(rows) + 0.5) * width / rows
@@ -0,0 +1,62 @@
+import unicodedata
+from bisect import bisect_left
+
+# Accent-insensitive prefix search for the entity dropdowns.
+# Every name is indexed under the start of each of its words ("Vinícius Júnior"
+# under "vinicius junior" and "junior"), and the keys are kept in one sorted
+# list, so a query is two binary searches plus a slice of the matches.
+MAX_RESULTS = 50
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(character for character in decomposed if not unicodedata.combining(character))
+    return ' '.join(stripped.casefold().split())
+
+
+def build_search_index(names):
+    entries = []
+    for name in dict.fromkeys(names):
+        if not isinstance(name, str):
+            continue
+        words = normalize(name).split(' ')
+        entries.extend((' '.join(words[start:]), name) for start in range(len(words)))
+    entries.sort()
+    return {
+        'keys': [key for key, _ in entries],
+        'names': [name for _, name in entries],
+        'sorted_names': sorted(dict.fromkeys(name for _, name in entries), key=normalize),
+    }
+
+
+def search(index, query, limit=MAX_RESULTS):
+    prefix = normalize(query)
+    if not prefix:
+        return index['sorted_names'][:limit]
+    keys = index['keys']
+    names = index['names']
+    start = bisect_left(keys, prefix)
+    stop = bisect_left(keys, prefix + '\U0010ffff', lo=start)
+
+    # Matches come out in key order; stop as soon as the cap is reached
+    matches = {}
+    for position in range(start, stop):
+        matches.setdefault(names[position])
+        if len(matches) == limit:
+            break
+    return list(matches)
+
+
+# The dropdown filters the returned options again in the browser, and its
+# tokenizer treats accented letters as word breaks; it indexes 'search' instead
+# of the label when present, so give it the unaccented form
+def dropdown_option(name):
+    return {'label': name, 'value': name, 'search': normalize(name)}
+
+
+# Dropdown options for a search, keeping the current selection selectable
+def search_options(index, query, selected=None, limit=MAX_RESULTS):
+    names = search(index, query, limit)
+    if selected is not None and selected not in names:
+        names = [selected] + names
+    return [dropdown_option(name) for name in names]
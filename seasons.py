@@ -0,0 +1,233 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from flask import jsonify, request
+
+from leaderboard import calculate_player_metrics
+from coach_metrics import calculate_scores
+
+# Season-partitioned storage for the player, manager and analyst tables.
+# Every appended batch (a whole season, or the totals of one matchday) is written
+# as its own Feather part under <root>/<table>/season=<season>/, so a query only
+# reads the parts of the seasons it asks for. Each season directory also keeps
+# the per-entity totals of its parts, and the table root keeps career totals;
+# both are updated from the appended batch alone. Rolling and career figures are
+# sums of those totals, never a re-read of the raw parts.
+SEASON_DIR = os.environ.get('SEASON_DATA_DIR', 'seasons')
+
+TABLES = {
+    'players': {
+        'key': 'player name',
+        'totals': ['Matches', 'goals', 'Minutes Played', 'Total Passes', 'Successful Passes'],
+    },
+    'managers': {
+        'key': 'Manager',
+        'totals': ['Matches', 'Wins', 'Draws', 'Losses', 'Goals Scored', 'Goals Conceded', 'Trophies'],
+    },
+    'analysts': {
+        'key': 'Performance Analyst',
+        'totals': ['Matches', 'Goals Scored', 'Goals Conceded', 'Passes Attempted', 'Passes Completed',
+                   'Set Piece Goals', 'Penalty Goals', 'Penalties Awarded'],
+    },
+}
+SEASON_PREFIX = 'season='
+TOTALS_FILE = 'totals.feather'
+CAREER_FILE = 'career.feather'
+
+
+def _schema(table):
+    try:
+        return TABLES[table]
+    except KeyError:
+        raise ValueError(f"Unknown table {table!r}, expected one of {', '.join(TABLES)}") from None
+
+
+def _read(path, columns=None):
+    if not os.path.exists(path):
+        return None
+    return pd.read_feather(path, columns=columns)
+
+
+def _write(frame, path):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    frame.reset_index(drop=True).to_feather(temporary_path, compression='uncompressed')
+    os.replace(temporary_path, path)
+
+
+# Sum per-entity totals, keeping the entity order of the first frame
+def _add(totals, delta, key):
+    frames = [frame for frame in (totals, delta) if frame is not None]
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True).groupby(key, sort=False, as_index=False).sum()
+
+
+# Win rate, goals per match and scores from summed totals, with the dashboards' formulas
+def with_metrics(table, totals):
+    if table == 'managers':
+        return calculate_scores(totals)
+    if table == 'players':
+        return totals.assign(**calculate_player_metrics(totals))
+    matches = totals['Matches'].to_numpy(dtype=float)
+    safe_matches = np.where(matches > 0, matches, 1)
+    return totals.assign(**{
+        'Goals per Match': np.where(matches > 0, totals['Goals Scored'].to_numpy(dtype=float) / safe_matches, 0),
+        'Conceded per Match': np.where(matches > 0, totals['Goals Conceded'].to_numpy(dtype=float) / safe_matches, 0),
+    })
+
+
+class SeasonStore:
+    def __init__(self, root=SEASON_DIR):
+        self.root = root
+
+    def table_dir(self, table):
+        _schema(table)
+        return os.path.join(self.root, table)
+
+    def season_dir(self, table, season):
+        return os.path.join(self.table_dir(table), f"{SEASON_PREFIX}{season}")
+
+    def seasons(self, table):
+        directory = self.table_dir(table)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[len(SEASON_PREFIX):] for name in os.listdir(directory) if name.startswith(SEASON_PREFIX))
+
+    def _parts(self, table, season):
+        directory = self.season_dir(table, season)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.startswith('part-'))
+
+    def append(self, table, season, frame):
+        schema = _schema(table)
+        missing = {schema['key'], *schema['totals']} - set(frame.columns)
+        if missing:
+            raise ValueError(f"{table} rows are missing columns: {', '.join(sorted(missing))}")
+        season = str(season)
+        directory = self.season_dir(table, season)
+        os.makedirs(directory, exist_ok=True)
+        _write(frame, os.path.join(directory, f"part-{time.time_ns()}.feather"))
+
+        delta = frame.groupby(schema['key'], sort=False, observed=True, as_index=False)[schema['totals']].sum()
+        totals_path = os.path.join(directory, TOTALS_FILE)
+        _write(_add(_read(totals_path), delta, schema['key']), totals_path)
+        career_path = os.path.join(self.table_dir(table), CAREER_FILE)
+        _write(_add(_read(career_path), delta, schema['key']), career_path)
+        return len(frame)
+
+    # Raw rows of the requested seasons only, optionally just some columns
+    def read(self, table, seasons=None, columns=None):
+        frames = []
+        for season in self.seasons(table) if seasons is None else [str(season) for season in seasons]:
+            for part in self._parts(table, season):
+                frames.append(pd.read_feather(part, columns=columns).assign(Season=season))
+        if not frames:
+            return pd.DataFrame(columns=(columns or []) + ['Season'])
+        return pd.concat(frames, ignore_index=True)
+
+    def season_totals(self, table, seasons):
+        schema = _schema(table)
+        totals = None
+        for season in seasons:
+            totals = _add(totals, _read(os.path.join(self.season_dir(table, season), TOTALS_FILE)), schema['key'])
+        if totals is None:
+            return pd.DataFrame(columns=[schema['key'], *schema['totals']])
+        return totals
+
+    def career(self, table):
+        schema = _schema(table)
+        career = _read(os.path.join(self.table_dir(table), CAREER_FILE))
+        if career is None:
+            return pd.DataFrame(columns=[schema['key'], *schema['totals']])
+        return career
+
+    def rolling(self, table, window, until=None):
+        if window < 0:
+            raise ValueError(f"The rolling window must not be negative, got {window}")
+        seasons = [season for season in self.seasons(table) if until is None or season <= str(until)]
+        # Sliced from the front: seasons[-0:] would be every season rather than none
+        return self.season_totals(table, seasons[max(len(seasons) - window, 0):])
+
+    # Recompute every totals file from the parts, e.g. after an interrupted append
+    def rebuild(self, table):
+        schema = _schema(table)
+        career = None
+        for season in self.seasons(table):
+            totals = None
+            for part in self._parts(table, season):
+                rows = pd.read_feather(part, columns=[schema['key'], *schema['totals']])
+                totals = _add(totals, rows.groupby(schema['key'], sort=False, as_index=False).sum(), schema['key'])
+            if totals is not None:
+                _write(totals, os.path.join(self.season_dir(table, season), TOTALS_FILE))
+                career = _add(career, totals, schema['key'])
+        if career is not None:
+            _write(career, os.path.join(self.table_dir(table), CAREER_FILE))
+
+
+def query(store, table, seasons=None, last=None, name=None):
+    if seasons:
+        totals = store.season_totals(table, seasons)
+    elif last:
+        totals = store.rolling(table, last)
+    else:
+        totals = store.career(table)
+    if name is not None:
+        totals = totals[totals[_schema(table)['key']] == name]
+    return with_metrics(table, totals)
+
+
+def init_app(app, store=None):
+    store = store or SeasonStore()
+
+    # GET /api/seasons/managers?seasons=2023,2024  |  ?last=3  |  (career)  &name=Diego%20Simeone
+    @app.server.route('/api/seasons/<table>')
+    def seasons_api(table):
+        seasons = [season for season in request.args.get('seasons', '').split(',') if season]
+        try:
+            last = int(request.args.get('last', 0))
+            totals = query(store, table, seasons, last, request.args.get('name'))
+        except ValueError as error:
+            return jsonify({'error': str(error)}), 400
+        if not seasons:
+            seasons = store.seasons(table)[-last:] if last else store.seasons(table)
+        return jsonify({'table': table, 'seasons': seasons, 'rows': totals.to_dict('records')})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Season-partitioned player, manager and analyst tables.')
+    parser.add_argument('--root', default=SEASON_DIR, help='directory holding the partitions')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    append = commands.add_parser('append', help='append a season or matchday CSV of per-entity totals')
+    append.add_argument('table', choices=TABLES)
+    append.add_argument('season')
+    append.add_argument('csv_files', nargs='+')
+
+    totals = commands.add_parser('totals', help='print totals and scores (career unless --seasons or --last)')
+    totals.add_argument('table', choices=TABLES)
+    totals.add_argument('--seasons', nargs='+')
+    totals.add_argument('--last', type=int, help='rolling window of the most recent seasons')
+    totals.add_argument('--name')
+
+    rebuild = commands.add_parser('rebuild', help='recompute the totals files from the stored parts')
+    rebuild.add_argument('table', choices=TABLES)
+    args = parser.parse_args(argv)
+
+    store = SeasonStore(args.root)
+    if args.command == 'append':
+        from data_loader import load_csv
+        for csv_file in args.csv_files:
+            appended = store.append(args.table, args.season, load_csv(csv_file, snapshot=False))
+            print(f"{csv_file}: {appended} rows appended to {args.table} {args.season}")
+    elif args.command == 'totals':
+        print(query(store, args.table, args.seasons, args.last, args.name).to_string(index=False))
+    else:
+        store.rebuild(args.table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from search_index import normalize
+
+# Team keys shared by the player, coach and analyst tables.
+# Each file spells clubs its own way ("FC Barcelona", "Barcelona", "Atlatico
+# Madrid"), so every spelling is reduced to one key: accents and case are
+# dropped, club-type affixes removed and known variants mapped by TEAM_ALIASES.
+# The team -> rows index is built once from the distinct spellings, so showing a
+# team is dict lookups rather than string matching or merges per request.
+
+# Affixes that are part of some spellings of a club name only
+CLUB_AFFIXES = {'fc', 'cf', 'cd', 'ud', 'sd', 'rcd'}
+
+# Other spellings (after normalization) -> key
+TEAM_ALIASES = {
+    'almaria': 'almeria',
+    'athletic club': 'athletic bilbao',
+    'atlatico madrid': 'atletico madrid',
+    'espaniol': 'espanyol',
+    'gerona': 'girona',
+    'maiorca': 'mallorca',
+    'raio vaicano': 'rayo vallecano',
+    'real betis balompie': 'real betis',
+    'valladolid': 'real valladolid',
+}
+
+# Sources in order of preference for the name a team is displayed under
+SOURCES = ('coaches', 'players', 'analysts')
+
+
+def _strip_affixes(name):
+    return ' '.join(word for word in normalize(name).split(' ') if word not in CLUB_AFFIXES)
+
+
+def team_key(name):
+    key = _strip_affixes(name)
+    return TEAM_ALIASES.get(key, key)
+
+
+# Distinct spellings of a team column and the row positions of each team key
+def _rows_by_team(column):
+    spellings = {name: team_key(name) for name in pd.unique(column) if isinstance(name, str)}
+    keys = pd.Series(column.map(spellings).to_numpy(dtype=object), index=np.arange(len(column)))
+    return spellings, dict(keys.groupby(keys, sort=False).indices)
+
+
+# formations are keyed by team_key already
+def build_team_index(columns, formations):
+    spellings = {}
+    rows = {}
+    for source in SOURCES:
+        source_spellings, rows[source] = _rows_by_team(columns[source])
+        for spelling, key in source_spellings.items():
+            spellings.setdefault(spelling, key)
+
+    # Display a team under a spelling that needed no alias, else under its key
+    names = {key: key.title() for key in spellings.values()}
+    for spelling, key in reversed(list(spellings.items())):
+        if _strip_affixes(spelling) == key:
+            names[key] = spelling
+    return {
+        'names': dict(sorted(names.items())),
+        'spellings': spellings,
+        'rows': rows,
+        'formations': formations,
+    }
+
+
+def team_rows(data, index, source, key):
+    positions = index['rows'][source].get(key)
+    if positions is None:
+        return data.iloc[0:0]
+    return data.iloc[positions]
@@ -0,0 +1,112 @@
+import plotly.graph_objects as go
+from dash import dcc, html, callback
+from dash.dependencies import Input, Output
+
+import data_store
+from figure_cache import figure_cache
+from team_index import build_team_index, team_rows
+import dashbord1
+import manger
+import Performance
+
+# Team view: the coach, analyst and players of one club side by side.
+# The team index is rebuilt whenever any of the player, coach, analyst or
+# formation files change, and keeps the tables it was built from, so its row
+# positions always refer to the same version of each table.
+PLAYER_COLUMNS = ['player name', 'Matches', 'goals', 'Minutes Played', 'Total Passes', 'Successful Passes']
+COACH_COLUMNS = ['Manager', 'Matches', 'Wins', 'Draws', 'Losses', 'Goals Scored', 'Goals Conceded', 'Trophies']
+ANALYST_COLUMNS = ['Performance Analyst', 'Matches', 'Goals Scored', 'Goals Conceded', 'Attack Rating', 'Defense Rating']
+
+
+def build_team_bundle(players, coaches, analysts):
+    tables = {
+        'players': players['data'],
+        'coaches': coaches['data'],
+        'analysts': analysts['data'],
+    }
+    columns = {
+        'players': tables['players']['player team'],
+        'coaches': tables['coaches']['Team'],
+        'analysts': tables['analysts']['Team'],
+    }
+    return {'tables': tables, 'index': build_team_index(columns, analysts['formations'])}
+
+
+def load_team_data(*paths):
+    return build_team_bundle(data_store.get('players'), data_store.get('coaches'), data_store.get('analysts'))
+
+
+data_store.register('teams', [dashbord1.file_path, manger.file_path_coaches, Performance.csv_file_path,
+                              Performance.formation_file_path], load_team_data)
+data_store.on_reload('teams', lambda bundle: figure_cache.invalidate('team'))
+
+
+def serve_layout():
+    names = data_store.get('teams')['index']['names']
+    return html.Div(style={'backgroundColor': '#0a0606', 'fontFamily': 'Roboto'}, children=[
+        html.H1('laliga Team Overview', style={'color': '#ffffff', 'textAlign': 'center'}),
+        dcc.Dropdown(
+            id='team-dropdown',
+            # The key is the unaccented name, which the browser-side filter needs (see search_index.dropdown_option)
+            options=[{'label': name, 'value': key, 'search': key} for key, name in names.items()],
+            value=next(iter(names), None),
+            clearable=False,
+            style={'width': '50%', 'backgroundColor': '#05ab92', 'color': '#05ab92', 'border': '1px solid #ffffff'}
+        ),
+        html.Div(id='team-staff', style={'color': '#ffffff'}),
+        dcc.Graph(id='team-goals-graph'),
+        html.Div(id='team-players', style={'color': '#ffffff'}),
+    ])
+
+
+@callback(
+    Output('team-staff', 'children'),
+    Output('team-goals-graph', 'figure'),
+    Output('team-players', 'children'),
+    Input('team-dropdown', 'value')
+)
+def update_team(selected_team):
+    teams = data_store.get('teams')
+    return figure_cache.get_or_render(('team', selected_team, teams['version']), lambda: render_team(teams, selected_team))
+
+
+def _table(rows, columns):
+    records = rows[columns].round(2).to_dict('records')
+    if not records:
+        return html.P('No data available')
+    return html.Table([
+        html.Thead(html.Tr([html.Th(column) for column in columns])),
+        html.Tbody([html.Tr([html.Td(record[column]) for column in columns]) for record in records]),
+    ], className='table table-dark table-sm')
+
+
+def render_team(teams, selected_team):
+    index = teams['index']
+    tables = teams['tables']
+    if selected_team not in index['names']:
+        return [html.P('No data available')], go.Figure(), None
+
+    coaches = team_rows(tables['coaches'], index, 'coaches', selected_team)
+    analysts = team_rows(tables['analysts'], index, 'analysts', selected_team)
+    players = team_rows(tables['players'], index, 'players', selected_team)
+
+    staff = [
+        html.H2(index['names'][selected_team]),
+        html.P(f"Preferred Formation: {index['formations'].get(selected_team, 'No formation available')}"),
+        html.H3('Coach'),
+        _table(coaches, COACH_COLUMNS),
+        html.H3('Performance Analyst'),
+        _table(analysts, ANALYST_COLUMNS),
+    ]
+
+    ordered = players.sort_values('goals', ascending=False)
+    goals_chart = go.Figure(go.Bar(x=ordered['player name'].astype(str), y=ordered['goals'], marker_color='#05ab92'))
+    goals_chart.update_layout(title='Goals by Player', template='plotly_dark')
+
+    return staff, goals_chart, [html.H3('Players'), _table(ordered, PLAYER_COLUMNS)]
+
+
+def warm_up_cache():
+    teams = data_store.get('teams')
+    figure_cache.warm_up('team', list(teams['index']['names']), teams['version'],
+                         lambda key: render_team(teams, key))
@@ -0,0 +1,141 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+# Multi-process serving for app.py.
+# The supervisor loads every dataset once in a short-lived process so the Feather
+# snapshots are on disk, binds the listening socket, and starts WEB_WORKERS
+# waitress processes on it. Workers map the snapshots instead of reading them
+# (DATA_MEMORY_MAP), so the numeric columns are shared through the page cache
+# rather than copied per worker. A worker that exits is started again.
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.environ.get('WEB_WORKERS', str(os.cpu_count() or 1)))
+THREADS = int(os.environ.get('WEB_THREADS', '4'))
+# Seconds between checks for exited workers
+CHECK_INTERVAL = 1.0
+# Workers that exit sooner than this after starting count as crash-looping
+MIN_UPTIME = 10.0
+
+
+def _configure_logging():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(process)d %(name)s %(levelname)s %(message)s')
+
+
+def _prepare():
+    _configure_logging()
+    import data_store
+    import app  # noqa: F401  (registers the datasets)
+
+    data_store.preload()
+
+
+def _serve(listener):
+    _configure_logging()
+    from waitress import serve
+
+    import app
+
+    app.start_background_tasks()
+    serve(app.server, sockets=[listener], threads=THREADS)
+
+
+def bind(host, port):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name != 'nt':
+        # On Windows this option lets other processes take over the port
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(1024)
+    return listener
+
+
+class Supervisor:
+    def __init__(self, listener, workers=WORKERS):
+        # spawn on every platform: a forked worker would inherit the parent's
+        # interpreter state instead of importing the app cleanly
+        self.context = multiprocessing.get_context('spawn')
+        self.listener = listener
+        self.workers = workers
+        self.processes = {}
+        # slot -> monotonic time at which an exited worker is started again
+        self.restarts = {}
+
+    def start_worker(self, slot):
+        process = self.context.Process(target=_serve, args=(self.listener,), name=f'worker-{slot}', daemon=True)
+        process.start()
+        self.processes[slot] = (process, time.monotonic())
+        logger.info("Started %s (pid %d)", process.name, process.pid)
+
+    def check(self):
+        now = time.monotonic()
+        restarted = []
+        for slot, (process, started) in list(self.processes.items()):
+            if slot not in self.restarts:
+                if process.is_alive():
+                    continue
+                uptime = now - started
+                logger.warning("%s (pid %d) exited with code %s after %.0fs", process.name, process.pid,
+                               process.exitcode, uptime)
+                # A worker that fails on startup waits out MIN_UPTIME instead of restarting in a tight
+                # loop; the wait is per slot, so other workers are still restarted on the next check
+                self.restarts[slot] = started + MIN_UPTIME if uptime < MIN_UPTIME else now
+            if now >= self.restarts[slot]:
+                del self.restarts[slot]
+                self.start_worker(slot)
+                restarted.append(slot)
+        return restarted
+
+    def run(self):
+        for slot in range(self.workers):
+            self.start_worker(slot)
+        try:
+            while True:
+                time.sleep(CHECK_INTERVAL)
+                self.check()
+        finally:
+            self.stop()
+
+    def stop(self):
+        for process, _ in self.processes.values():
+            process.terminate()
+        for process, _ in self.processes.values():
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+
+# SIGTERM (and SIGINT) unwind through Supervisor.run, which stops the workers
+def _exit_on_signal(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+def main():
+    _configure_logging()
+    # Inherited by the spawned processes
+    os.environ['DATA_MEMORY_MAP'] = '1'
+
+    context = multiprocessing.get_context('spawn')
+    preparation = context.Process(target=_prepare, name='prepare')
+    preparation.start()
+    preparation.join()
+    if preparation.exitcode != 0:
+        raise SystemExit(f"Loading the datasets failed with exit code {preparation.exitcode}")
+
+    listener = bind('0.0.0.0', int(os.environ.get('PORT', '8000')))
+    logger.info("Serving on port %d with %d workers", listener.getsockname()[1], WORKERS)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    signal.signal(signal.SIGINT, _exit_on_signal)
+    try:
+        Supervisor(listener).run()
+    finally:
+        listener.close()
+        logger.info("Stopped")
+
+
+if __name__ == '__main__':
+    main()